@@ -0,0 +1,11 @@
+-- Migration: Add indexes used by post attribution builds
+-- Run this on your existing database to add the new indexes
+
+-- Nearest-interval lookups order intervals by end_at
+CREATE INDEX IF NOT EXISTS ix_intervals_end_at ON intervals(end_at);
+
+-- New-follower lookups filter on (interval_id, kind) and read only account_id
+CREATE INDEX IF NOT EXISTS ix_follow_events_interval_kind ON follow_events(interval_id, kind, account_id);
+
+-- Engagement lookups by post read only the source account
+CREATE INDEX IF NOT EXISTS ix_interaction_events_post_src ON interaction_events(post_id, src_id);
@@ -1,6 +1,5 @@
 """FastAPI application for Social Graph."""
 from datetime import datetime
-import json
 from typing import Optional
 from fastapi import FastAPI, Depends, HTTPException, BackgroundTasks
 from fastapi.middleware.cors import CORSMiddleware
@@ -22,7 +21,7 @@ from .collector import Collector
 from .twitter_client import TwitterClient
 from .frame_builder import FrameBuilder
 from .mock_posts import generate_mock_posts
-from .post_attribution import build_post_attributions
+from .post_attribution import build_post_attributions, decode_payload
 
 
 app = FastAPI(
@@ -51,6 +50,12 @@ async def startup():
     init_db()
 
 
+@app.on_event("shutdown")
+async def shutdown():
+    """Close pooled API connections."""
+    await TwitterClient.shutdown()
+
+
 # =============================================================================
 # Schemas
 # =============================================================================
@@ -169,9 +174,8 @@ def _build_action_events(
     ).all()
 
     for row in attribution_rows:
-        try:
-            payload = json.loads(row.payload_json)
-        except json.JSONDecodeError:
+        payload = decode_payload(row)
+        if payload is None:
             continue
 
         follower_ids = payload.get("attributed_follower_ids") or []
@@ -4,8 +4,14 @@ import argparse
 import sys
 import json
 
+try:
+    import uvloop
+except ImportError:  # installed with uvicorn[standard], except on Windows
+    uvloop = None
+
 from .database import init_db, SessionLocal
 from .collector import Collector
+from .twitter_client import TwitterClient
 from .models import Run, Snapshot, Interval, Account
 from .post_attribution import build_post_attributions
 from .mock_posts import seed_mock_post_attributions
@@ -66,10 +72,14 @@ async def cmd_collect_async(args):
         raise
     finally:
         db.close()
+        await TwitterClient.shutdown()
 
 
 def cmd_collect(args):
     """Run data collection (sync wrapper)."""
+    # The API server already gets uvloop from uvicorn; match it here
+    if uvloop is not None:
+        asyncio.set_event_loop_policy(uvloop.EventLoopPolicy())
     return asyncio.run(cmd_collect_async(args))
 
 
@@ -1,6 +1,5 @@
 """Data collector - fetches Twitter data and stores snapshots."""
 import json
-import hashlib
 import logging
 from datetime import datetime, timezone
 from typing import Optional
@@ -12,7 +11,7 @@ from .models import (
     SnapshotFollower, SnapshotFollowing, Interval, FollowEvent,
     InteractionEvent, PostEngager
 )
-from .twitter_client import TwitterClient, TwitterAPIError
+from .twitter_client import TwitterClient, TwitterAPIError, params_hash
 from .config import settings
 
 
@@ -111,14 +110,10 @@ class Collector:
         payload: dict
     ) -> RawFetch:
         """Store raw API response."""
-        params_hash = hashlib.sha256(
-            json.dumps(params, sort_keys=True).encode()
-        ).hexdigest()[:16]
-        
         raw = RawFetch(
             run_id=self.run.run_id,
             endpoint=endpoint,
-            params_hash=params_hash,
+            params_hash=params_hash(params),
             cursor_in=cursor_in,
             cursor_out=cursor_out,
             truncated=truncated,
@@ -873,24 +868,19 @@ class Collector:
 
                 # Collect who this account follows
                 following_ids = []
-                page_count = 0
                 max_pages = max(1, max_per_account // 100)  # ~100 per page
 
                 async for users, cursor_in, cursor_out, truncated in self.twitter.paginate_following(
-                    account.handle,
-                    max_results=100
+                    account_id,
+                    max_results=100,
+                    max_pages=max_pages,
+                    username=account.handle
                 ):
                     for user in users:
                         following_ids.append(user.get("id"))
                         # Also upsert the account
                         self._upsert_account(user)
 
-                    page_count += 1
-                    if page_count >= max_pages:
-                        break
-                    if not cursor_out:
-                        break
-
                 # Store connections
                 for following_id in following_ids:
                     # Check if connection already exists
@@ -30,6 +30,12 @@ class Settings(BaseSettings):
     max_engagers_per_post: int = Field(default=500)
     co_engagement_window_hours: int = Field(default=72)
     attribution_lookback_days: int = Field(default=7)
+    attribution_cache_ttl_seconds: float = Field(default=60.0)
+
+    # On-disk cache of raw API responses, for re-running crawls during development
+    api_cache_enabled: bool = Field(default=False)
+    api_cache_path: str = Field(default="./api_cache.db")
+    api_cache_ttl_seconds: float = Field(default=7 * 24 * 3600.0)
 
     # Config versioning
     config_version: str = Field(default="1.0.0")
@@ -1,6 +1,10 @@
 """Database connection and session management."""
-from sqlalchemy import create_engine
-from sqlalchemy.orm import sessionmaker, DeclarativeBase
+from typing import Iterable
+
+from sqlalchemy import create_engine, event
+from sqlalchemy.dialects.postgresql import insert as postgresql_insert
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from sqlalchemy.orm import Session, sessionmaker, DeclarativeBase
 
 from .config import settings
 
@@ -12,9 +16,21 @@ class Base(DeclarativeBase):
 
 engine = create_engine(
     settings.database_url,
-    connect_args={"check_same_thread": False}  # SQLite specific
+    connect_args={"check_same_thread": False},  # SQLite specific
+    query_cache_size=1200,  # Room for every ORM query shape the builders issue
 )
 
+
+@event.listens_for(engine, "connect")
+def _set_sqlite_pragmas(dbapi_connection, connection_record):
+    """WAL + synchronous=NORMAL: commits skip most fsyncs, still crash-safe."""
+    if engine.dialect.name != "sqlite":
+        return
+    cursor = dbapi_connection.cursor()
+    cursor.execute("PRAGMA journal_mode=WAL")
+    cursor.execute("PRAGMA synchronous=NORMAL")
+    cursor.close()
+
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
 
@@ -31,3 +47,28 @@ def init_db():
     """Initialize database tables."""
     from . import models  # noqa: F401
     Base.metadata.create_all(bind=engine)
+
+
+def dialect_insert(db: Session, model):
+    """INSERT construct with ON CONFLICT support for the session's dialect."""
+    if db.get_bind().dialect.name == "postgresql":
+        return postgresql_insert(model)
+    return sqlite_insert(model)
+
+
+def upsert_rows(
+    db: Session,
+    model,
+    index_elements: list[str],
+    update_columns: Iterable[str],
+    rows: list[dict],
+) -> None:
+    """INSERT ... ON CONFLICT (index_elements) DO UPDATE the given columns."""
+    stmt = dialect_insert(db, model)
+    db.execute(
+        stmt.on_conflict_do_update(
+            index_elements=index_elements,
+            set_={column: stmt.excluded[column] for column in update_columns},
+        ),
+        rows,
+    )
@@ -7,23 +7,25 @@ Implements the graph computation from AGENTS.md:
 4. Position calculation with layout stability
 5. Frame JSON generation
 """
-import json
 import logging
 import math
-import random
+from bisect import bisect_left
 from collections import defaultdict
 from datetime import datetime, timedelta, timezone
 from typing import Optional, Dict, List, Set, Tuple
-from dataclasses import dataclass, asdict
+from dataclasses import dataclass, asdict, field
 
+import numpy as np
 from sqlalchemy.orm import Session
-from sqlalchemy import func
+from sqlalchemy import delete, func
 
 from .models import (
     Interval, Edge, Community, Position, PositionHistory, Frame,
-    InteractionEvent, PostEngager, Account, FollowEvent
+    InteractionEvent, PostEngager, Account, FollowEvent,
+    Snapshot, SnapshotFollower, SnapshotFollowing
 )
 from .config import settings
+from . import jsonutil
 
 
 logger = logging.getLogger(__name__)
@@ -52,6 +54,14 @@ MAX_NODES_RENDERED = 2000
 MAX_EDGES_RENDERED = 12000
 MAX_EDGES_PER_NODE = 50
 MIN_FOLLOWERS_FOR_DISPLAY = 500  # Filter out small accounts - only show meaningful connections
+EVENT_STREAM_BATCH_SIZE = 10_000  # Rows fetched per round-trip when streaming events
+STABLE_LAYOUT_NEW_FRACTION = 0.05  # Below this share of new nodes, only relax briefly
+STABLE_LAYOUT_ITERATIONS = 5
+VECTORIZE_MIN_NODES = 64  # Below this, plain Python beats NumPy setup cost
+IN_CLAUSE_CHUNK_SIZE = 500  # Max ids per IN (...) when loading accounts
+GRID_REPULSION_MIN_NODES = 500  # Switch to cutoff repulsion at this graph size
+REPULSION_CUTOFF = 120.0  # Beyond this distance repulsion is negligible (<0.05)
+PRUNE_SCORE_COVERAGE = 0.98  # Keep the smallest top-scored prefix covering this share
 
 # 6-Tier Hierarchy Thresholds (for network routing)
 TIER_THRESHOLDS = {
@@ -98,7 +108,7 @@ def classify_follower_tier(followers_count: int) -> int:
         return 6
 
 
-@dataclass
+@dataclass(slots=True)
 class GraphNode:
     """Node for graph computation."""
     account_id: str
@@ -115,7 +125,7 @@ class GraphNode:
     is_ego: bool = False  # The central user (you)
 
 
-@dataclass
+@dataclass(slots=True)
 class GraphEdge:
     """Edge for graph computation."""
     src_id: str
@@ -123,6 +133,30 @@ class GraphEdge:
     edge_type: str
     weight: float
     meta: dict = None
+    # Undirected identity (low id, high id, type), computed once for pruning
+    canon_key: Tuple[str, str, str] = field(init=False, repr=False, compare=False)
+
+    def __post_init__(self):
+        if self.src_id <= self.dst_id:
+            self.canon_key = (self.src_id, self.dst_id, self.edge_type)
+        else:
+            self.canon_key = (self.dst_id, self.src_id, self.edge_type)
+
+
+# =============================================================================
+# Query Helpers
+# =============================================================================
+
+def iter_in_chunks(query, column, ids, chunk_size: int = IN_CLAUSE_CHUNK_SIZE):
+    """
+    Yield rows of query filtered by column IN ids, batching the id list.
+
+    Keeps each IN (...) under SQLite's bound-parameter limit and avoids
+    handing the planner one enormous literal list.
+    """
+    ids = list(ids)
+    for start in range(0, len(ids), chunk_size):
+        yield from query.filter(column.in_(ids[start:start + chunk_size]))
 
 
 # =============================================================================
@@ -168,22 +202,27 @@ def build_edges_from_interactions(
     else:
         window_start = datetime.min
     
-    # Query interaction events
-    events = db.query(InteractionEvent).filter(
+    # Stream only the columns we aggregate on; memory stays O(unique edges)
+    events = db.query(
+        InteractionEvent.src_id,
+        InteractionEvent.dst_id,
+        InteractionEvent.interaction_type,
+        InteractionEvent.created_at
+    ).filter(
         InteractionEvent.created_at >= window_start,
         InteractionEvent.created_at <= reference_time
-    ).all()
-    
+    ).yield_per(EVENT_STREAM_BATCH_SIZE)
+
     # Aggregate edges by (src, dst, type)
     edge_agg: Dict[Tuple[str, str, str], float] = defaultdict(float)
-    
+
+    # Bind hot-loop lookups to locals (avoids global resolution per event)
+    get_weight = EDGE_WEIGHTS.get
+    decay_for = compute_recency_decay
+
     for event in events:
-        base_weight = EDGE_WEIGHTS.get(event.interaction_type, 1.0)
-        decay = compute_recency_decay(event.created_at, reference_time)
-        weight = base_weight * decay
-        
-        key = (event.src_id, event.dst_id, "direct_interaction")
-        edge_agg[key] += weight
+        weight = get_weight(event.interaction_type, 1.0) * decay_for(event.created_at, reference_time)
+        edge_agg[(event.src_id, event.dst_id, "direct_interaction")] += weight
     
     return [
         GraphEdge(src_id=src, dst_id=dst, edge_type=etype, weight=w)
@@ -211,35 +250,29 @@ def build_edges_from_coengagement(
     else:
         window_start = datetime.min
     
-    # Query post engagers within window
-    engagers = db.query(PostEngager).join(
+    # Stream post engagers within window
+    engagers = db.query(PostEngager.post_id, PostEngager.account_id).join(
         Interval, PostEngager.interval_id == Interval.interval_id
     ).filter(
         Interval.end_at >= window_start,
         Interval.end_at <= reference_time
-    ).all()
-    
+    ).yield_per(EVENT_STREAM_BATCH_SIZE)
+
     # Group by post
-    post_engagers: Dict[str, List[Tuple[str, str]]] = defaultdict(list)
-    for pe in engagers:
-        post_engagers[pe.post_id].append((pe.account_id, pe.engager_type))
-    
+    post_engagers: Dict[str, Set[str]] = defaultdict(set)
+    for post_id, account_id in engagers:
+        post_engagers[post_id].add(account_id)
+
     # Build co-engagement edges
     edge_agg: Dict[Tuple[str, str], float] = defaultdict(float)
-    
-    for post_id, engager_list in post_engagers.items():
-        account_ids = list(set(aid for aid, _ in engager_list))
-        
+    # Sorted ids give src < dst for every pair without a per-pair compare
+    for engager_ids in post_engagers.values():
+        account_ids = sorted(engager_ids)
+
         # Create edges between all pairs
         for i, aid_i in enumerate(account_ids):
             for aid_j in account_ids[i + 1:]:
-                # Normalize direction
-                if aid_i < aid_j:
-                    key = (aid_i, aid_j)
-                else:
-                    key = (aid_j, aid_i)
-                
-                edge_agg[key] += 1.0  # Count shared engagements
+                edge_agg[(aid_i, aid_j)] += 1.0  # Count shared engagements
     
     return [
         GraphEdge(src_id=src, dst_id=dst, edge_type="co_engagement", weight=w)
@@ -289,8 +322,6 @@ def build_edges_from_follow_events(
        based on follower count similarity - this makes the graph grow outward
     2. Connect new followers to each other in small clusters
     """
-    from .models import SnapshotFollower, Snapshot
-
     # Get new followers in this interval
     new_followers = db.query(FollowEvent).filter(
         FollowEvent.interval_id == interval.interval_id,
@@ -305,25 +336,28 @@ def build_edges_from_follow_events(
     # Get existing nodes from previous intervals (nodes that aren't new)
     if existing_node_ids is None:
         # Query all accounts that were followers before this interval
-        prev_snapshots = db.query(Snapshot).filter(
-            Snapshot.kind == "followers",
-            Snapshot.captured_at < interval.start_at
-        ).all()
-
-        existing_node_ids = set()
-        for snap in prev_snapshots:
-            for sf in snap.followers:
-                existing_node_ids.add(sf.account_id)
+        existing_node_ids = {
+            account_id for (account_id,) in db.query(SnapshotFollower.account_id).join(
+                Snapshot, SnapshotFollower.snapshot_id == Snapshot.snapshot_id
+            ).filter(
+                Snapshot.kind == "followers",
+                Snapshot.captured_at < interval.start_at
+            ).distinct()
+        }
 
     # Remove new IDs from existing (they're new, not existing)
     existing_node_ids = existing_node_ids - new_ids
 
-    # Get account data for all relevant accounts
+    # Only follower counts are needed, so skip full ORM hydration
     all_ids = list(new_ids | existing_node_ids)
-    accounts = db.query(Account).filter(
-        Account.account_id.in_(all_ids)
-    ).all()
-    account_map = {a.account_id: a for a in accounts}
+    follower_counts: Dict[str, int] = {
+        account_id: followers_count or 0
+        for account_id, followers_count in iter_in_chunks(
+            db.query(Account.account_id, Account.followers_count),
+            Account.account_id,
+            all_ids
+        )
+    }
 
     edges = []
 
@@ -332,20 +366,18 @@ def build_edges_from_follow_events(
     existing_list = list(existing_node_ids)
 
     for new_id in new_ids:
-        new_acc = account_map.get(new_id)
-        if not new_acc:
+        if new_id not in follower_counts:
             continue
 
-        new_followers_count = new_acc.followers_count or 1
+        new_followers_count = follower_counts[new_id] or 1
 
         # Find best matches in existing network based on follower tier
         candidates = []
         for exist_id in existing_list:
-            exist_acc = account_map.get(exist_id)
-            if not exist_acc:
+            if exist_id not in follower_counts:
                 continue
 
-            exist_followers = exist_acc.followers_count or 1
+            exist_followers = follower_counts[exist_id] or 1
 
             # Calculate tier similarity (log scale)
             ratio = max(new_followers_count, exist_followers) / max(min(new_followers_count, exist_followers), 1)
@@ -369,10 +401,9 @@ def build_edges_from_follow_events(
     # (accounts that joined together likely have affinity)
     new_list = list(new_ids)
     for i, id1 in enumerate(new_list):
-        acc1 = account_map.get(id1)
-        if not acc1:
+        if id1 not in follower_counts:
             continue
-        f1 = acc1.followers_count or 1
+        f1 = follower_counts[id1] or 1
 
         # Only connect to a few nearby new nodes (limit clustering)
         connections = 0
@@ -380,10 +411,9 @@ def build_edges_from_follow_events(
             if connections >= 3:  # Max 3 peer connections per node
                 break
 
-            acc2 = account_map.get(id2)
-            if not acc2:
+            if id2 not in follower_counts:
                 continue
-            f2 = acc2.followers_count or 1
+            f2 = follower_counts[id2] or 1
 
             ratio = max(f1, f2) / max(min(f1, f2), 1)
 
@@ -465,13 +495,33 @@ def simple_community_detection(
 # Layout Computation (Force-Directed with Stability)
 # =============================================================================
 
+def previous_interval_id(db: Session, interval: Interval) -> Optional[int]:
+    """Id of the interval before `interval`, if any."""
+    return db.query(Interval.interval_id).filter(
+        Interval.interval_id < interval.interval_id
+    ).order_by(Interval.interval_id.desc()).limit(1).scalar()
+
+
+def previous_positions(db: Session, interval: Interval) -> Dict[str, Tuple[float, float, float]]:
+    """Saved positions of the interval before `interval`; they seed its layout."""
+    prev_interval_id = previous_interval_id(db, interval)
+    if prev_interval_id is None:
+        return {}
+
+    prev_pos_records = db.query(Position).filter(
+        Position.interval_id == prev_interval_id
+    ).all()
+    return {p.account_id: (p.x, p.y, p.z) for p in prev_pos_records}
+
+
 def compute_positions(
     db: Session,
     interval: Interval,
     nodes: List[GraphNode],
     edges: List[GraphEdge],
     communities: Dict[str, int],
-    ego_id: str = None
+    ego_id: str = None,
+    prev_positions: Optional[Dict[str, Tuple[float, float, float]]] = None
 ) -> Dict[str, Tuple[float, float, float]]:
     """
     Compute node positions using force-directed layout with stability.
@@ -482,92 +532,155 @@ def compute_positions(
     - Bounded iterations for stability
     """
     # Get previous positions if available
-    prev_positions: Dict[str, Tuple[float, float, float]] = {}
-    
-    prev_interval = db.query(Interval).filter(
-        Interval.interval_id < interval.interval_id
-    ).order_by(Interval.interval_id.desc()).first()
-    
-    if prev_interval:
-        prev_pos_records = db.query(Position).filter(
-            Position.interval_id == prev_interval.interval_id
-        ).all()
-        prev_positions = {p.account_id: (p.x, p.y, p.z) for p in prev_pos_records}
-    
+    if prev_positions is None:
+        prev_positions = previous_positions(db, interval)
+
     # Build adjacency for neighbor lookup
     adjacency: Dict[str, List[Tuple[str, float]]] = defaultdict(list)
     for edge in edges:
         adjacency[edge.src_id].append((edge.dst_id, edge.weight))
         adjacency[edge.dst_id].append((edge.src_id, edge.weight))
     
+    # Seeded per interval so rebuilding a frame reproduces the same layout
+    rng = np.random.default_rng(interval.interval_id)
+
     # Precompute community centroids (for clustered layout)
     unique_communities = sorted(set(communities.values())) if communities else [0]
-    community_index = {cid: idx for idx, cid in enumerate(unique_communities)}
+    community_z = rng.uniform(-8, 8, size=len(unique_communities)).tolist()
     community_positions: Dict[int, Tuple[float, float, float]] = {}
     base_radius = 60.0
-    for cid in unique_communities:
-        idx = community_index[cid]
+    for idx, cid in enumerate(unique_communities):
         angle = idx * 2.0 * math.pi / max(len(unique_communities), 1)
         community_positions[cid] = (
             base_radius * math.cos(angle),
             base_radius * math.sin(angle),
-            random.uniform(-8, 8)
+            community_z[idx]
         )
 
+    # Draw jitter for every node that needs seeding in one batch
+    new_count = sum(1 for node in nodes if node.account_id not in prev_positions)
+    neighbor_offsets = rng.uniform(-2.0, 2.0, size=(new_count, 3)).tolist()
+    community_offsets = (
+        rng.uniform(-1.0, 1.0, size=(new_count, 3)) * (10.0, 10.0, 6.0)
+    ).tolist()
+
     # Initialize positions
     positions: Dict[str, Tuple[float, float, float]] = {}
-    
+    new_index = 0
+
     for node in nodes:
         if node.account_id in prev_positions:
             # Use previous position
             positions[node.account_id] = prev_positions[node.account_id]
-        else:
-            # Seed near strongest neighbor or use community-based position
-            neighbors = adjacency.get(node.account_id, [])
-            
-            if neighbors:
-                # Find strongest neighbor with a position
-                neighbors.sort(key=lambda x: -x[1])
-                for neighbor_id, _ in neighbors:
-                    if neighbor_id in positions:
-                        nx, ny, nz = positions[neighbor_id]
-                        # Add small random offset
-                        offset = 2.0
-                        positions[node.account_id] = (
-                            nx + random.uniform(-offset, offset),
-                            ny + random.uniform(-offset, offset),
-                            nz + random.uniform(-offset, offset)
-                        )
-                        break
-            
-            if node.account_id not in positions:
-                # Use community-based clustered positioning
-                community = communities.get(node.account_id, 0)
-                cx, cy, cz = community_positions.get(community, (0.0, 0.0, 0.0))
-                positions[node.account_id] = (
-                    cx + random.uniform(-10, 10),
-                    cy + random.uniform(-10, 10),
-                    cz + random.uniform(-6, 6)
-                )
+            continue
+
+        # Seed near strongest neighbor or use community-based position
+        neighbors = adjacency.get(node.account_id, [])
+
+        if neighbors:
+            # Find strongest neighbor with a position
+            neighbors.sort(key=lambda x: -x[1])
+            for neighbor_id, _ in neighbors:
+                if neighbor_id in positions:
+                    nx, ny, nz = positions[neighbor_id]
+                    # Add small random offset
+                    ox, oy, oz = neighbor_offsets[new_index]
+                    positions[node.account_id] = (nx + ox, ny + oy, nz + oz)
+                    break
+
+        if node.account_id not in positions:
+            # Use community-based clustered positioning
+            community = communities.get(node.account_id, 0)
+            cx, cy, cz = community_positions.get(community, (0.0, 0.0, 0.0))
+            ox, oy, oz = community_offsets[new_index]
+            positions[node.account_id] = (cx + ox, cy + oy, cz + oz)
+
+        new_index += 1
     
     # Pin ego at center before layout
     if ego_id:
         positions[ego_id] = (0.0, 0.0, 0.0)
 
+    # Mostly pre-positioned graphs only need a short, cool pass to settle
+    # the few new nodes in; everything else is already laid out
+    max_iterations = 60
+    initial_temperature = 10.0
+    new_fraction = new_count / len(nodes) if nodes else 0.0
+    if prev_positions and new_fraction < STABLE_LAYOUT_NEW_FRACTION:
+        max_iterations = STABLE_LAYOUT_ITERATIONS
+        initial_temperature *= max(new_fraction / STABLE_LAYOUT_NEW_FRACTION, 0.2)
+
     # Simple force-directed relaxation (bounded iterations)
     positions = force_directed_layout(
         nodes,
         edges,
         positions,
-        max_iterations=60,
+        max_iterations=max_iterations,
         ego_id=ego_id,
         communities=communities,
-        community_centroids=community_positions
+        community_centroids=community_positions,
+        initial_temperature=initial_temperature
     )
 
     return positions
 
 
+def _repulsion_forces(pos: np.ndarray, k_repulsion: float) -> np.ndarray:
+    """Repulsion between all node pairs (O(n²))."""
+    n = len(pos)
+    forces = np.zeros((n, 3))
+    for i in range(n - 1):
+        delta = pos[i] - pos[i + 1:]
+        dist = np.sqrt(np.einsum("ij,ij->i", delta, delta)) + 0.01
+        pair_forces = (k_repulsion / (dist * dist * dist))[:, None] * delta
+        forces[i] += pair_forces.sum(axis=0)
+        forces[i + 1:] -= pair_forces
+    return forces
+
+
+def _grid_repulsion_forces(
+    pos: np.ndarray,
+    k_repulsion: float,
+    cutoff: float,
+    block_size: int = 256
+) -> np.ndarray:
+    """
+    Repulsion limited to pairs closer than cutoff, via spatial hashing.
+
+    Nodes are binned into cubic cells of side cutoff, so every pair within
+    range sits in the same or one of the 26 adjacent cells. Cost is roughly
+    O(n * neighbours) instead of O(n²) once the graph has spread out.
+    """
+    n = len(pos)
+    forces = np.zeros((n, 3))
+
+    cells: Dict[Tuple[int, int, int], List[int]] = defaultdict(list)
+    for i, cell in enumerate(np.floor(pos / cutoff).astype(np.int64).tolist()):
+        cells[tuple(cell)].append(i)
+    cell_members = {cell: np.array(idx, dtype=np.int64) for cell, idx in cells.items()}
+
+    offsets = [(dx, dy, dz) for dx in (-1, 0, 1) for dy in (-1, 0, 1) for dz in (-1, 0, 1)]
+    for (cx, cy, cz), members in cell_members.items():
+        neighbors = np.concatenate([
+            cell_members[key] for key in (
+                (cx + dx, cy + dy, cz + dz) for dx, dy, dz in offsets
+            )
+            if key in cell_members
+        ])
+        neighbor_pos = pos[neighbors]
+
+        # Block the members so dense cells stay within bounded memory
+        for start in range(0, len(members), block_size):
+            block = members[start:start + block_size]
+            delta = pos[block][:, None, :] - neighbor_pos[None, :, :]
+            dist = np.sqrt(np.einsum("ijk,ijk->ij", delta, delta)) + 0.01
+            # Self-pairs have zero delta and contribute nothing
+            scale = np.where(dist <= cutoff, k_repulsion / (dist * dist * dist), 0.0)
+            forces[block] += np.einsum("ij,ijk->ik", scale, delta)
+
+    return forces
+
+
 def force_directed_layout(
     nodes: List[GraphNode],
     edges: List[GraphEdge],
@@ -576,7 +689,9 @@ def force_directed_layout(
     cooling_factor: float = 0.95,
     ego_id: str = None,
     communities: Optional[Dict[str, int]] = None,
-    community_centroids: Optional[Dict[int, Tuple[float, float, float]]] = None
+    community_centroids: Optional[Dict[int, Tuple[float, float, float]]] = None,
+    convergence_threshold: float = 0.05,
+    initial_temperature: float = 10.0
 ) -> Dict[str, Tuple[float, float, float]]:
     """
     Simple 3D force-directed layout with ego node pinned at center.
@@ -585,6 +700,7 @@ def force_directed_layout(
     - Repulsion between all nodes
     - Attraction along edges
     - Bounded iterations for stability
+    - Stops early once no node moves more than convergence_threshold
     """
     positions = dict(initial_positions)
 
@@ -596,115 +712,77 @@ def force_directed_layout(
     k_repulsion = 700.0   # Repulsion constant
     k_attraction = 0.02   # Attraction constant
     k_community = 0.03    # Community clustering force
-    temperature = 10.0    # Initial movement limit
+    temperature = initial_temperature  # Initial movement limit
+
+    # Index the positioned nodes once so the iteration loop works on a
+    # dense (n, 3) array instead of hashing account ids on every access
+    node_ids = [n.account_id for n in nodes if n.account_id in positions]
+    node_index = {nid: i for i, nid in enumerate(node_ids)}
+    n = len(node_ids)
+    ego_index = node_index.get(ego_id) if ego_id else None
+
+    pos = np.array([positions[nid] for nid in node_ids], dtype=np.float64).reshape(n, 3)
+
+    # Edge endpoints resolved to index arrays up front
+    layout_edges = [
+        edge for edge in edges
+        if edge.src_id in node_index and edge.dst_id in node_index
+    ]
+    edge_src = np.array([node_index[e.src_id] for e in layout_edges], dtype=np.int32)
+    edge_dst = np.array([node_index[e.dst_id] for e in layout_edges], dtype=np.int32)
+    # Attraction is k * dist * weight along the unit vector, so dist cancels
+    edge_k = k_attraction * np.array([e.weight for e in layout_edges], dtype=np.float64)
+
+    # Community centroid each node is pulled toward
+    centroids = None
+    if communities and community_centroids:
+        centroids = np.array([
+            community_centroids.get(communities.get(nid, 0), (0.0, 0.0, 0.0))
+            for nid in node_ids
+        ], dtype=np.float64).reshape(n, 3)
 
-    node_ids = [n.account_id for n in nodes]
-    
-    # Build edge lookup
-    edge_pairs: Set[Tuple[str, str]] = set()
-    edge_weights: Dict[Tuple[str, str], float] = {}
-    
-    for edge in edges:
-        pair = (edge.src_id, edge.dst_id)
-        edge_pairs.add(pair)
-        edge_pairs.add((edge.dst_id, edge.src_id))
-        edge_weights[pair] = edge.weight
-        edge_weights[(edge.dst_id, edge.src_id)] = edge.weight
-    
     for iteration in range(max_iterations):
-        forces: Dict[str, Tuple[float, float, float]] = {nid: (0, 0, 0) for nid in node_ids}
-        
-        # Repulsion between all node pairs (O(n²) - fine for < 2000 nodes)
-        for i, nid_i in enumerate(node_ids):
-            if nid_i not in positions:
-                continue
-            xi, yi, zi = positions[nid_i]
-            
-            for nid_j in node_ids[i + 1:]:
-                if nid_j not in positions:
-                    continue
-                xj, yj, zj = positions[nid_j]
-                
-                dx = xi - xj
-                dy = yi - yj
-                dz = zi - zj
-                dist = math.sqrt(dx * dx + dy * dy + dz * dz) + 0.01
-                
-                # Repulsion force
-                force = k_repulsion / (dist * dist)
-                fx = force * dx / dist
-                fy = force * dy / dist
-                fz = force * dz / dist
-                
-                forces[nid_i] = (forces[nid_i][0] + fx, forces[nid_i][1] + fy, forces[nid_i][2] + fz)
-                forces[nid_j] = (forces[nid_j][0] - fx, forces[nid_j][1] - fy, forces[nid_j][2] - fz)
-        
-        # Attraction along edges
-        for edge in edges:
-            if edge.src_id not in positions or edge.dst_id not in positions:
-                continue
-            
-            x1, y1, z1 = positions[edge.src_id]
-            x2, y2, z2 = positions[edge.dst_id]
-            
-            dx = x2 - x1
-            dy = y2 - y1
-            dz = z2 - z1
-            dist = math.sqrt(dx * dx + dy * dy + dz * dz) + 0.01
-            
-            # Attraction force (proportional to distance and weight)
-            force = k_attraction * dist * edge.weight
-            fx = force * dx / dist
-            fy = force * dy / dist
-            fz = force * dz / dist
-            
-            forces[edge.src_id] = (forces[edge.src_id][0] + fx, forces[edge.src_id][1] + fy, forces[edge.src_id][2] + fz)
-            forces[edge.dst_id] = (forces[edge.dst_id][0] - fx, forces[edge.dst_id][1] - fy, forces[edge.dst_id][2] - fz)
+        forces = np.zeros((n, 3))
 
-        # Community clustering toward centroid
-        if communities and community_centroids:
-            for nid in node_ids:
-                if nid not in positions:
-                    continue
-                cid = communities.get(nid, 0)
-                cx, cy, cz = community_centroids.get(cid, (0.0, 0.0, 0.0))
-                x, y, z = positions[nid]
-                dx = cx - x
-                dy = cy - y
-                dz = cz - z
-                dist = math.sqrt(dx * dx + dy * dy + dz * dz) + 0.01
-                force = k_community * dist
-                fx = force * dx / dist
-                fy = force * dy / dist
-                fz = force * dz / dist
-                forces[nid] = (forces[nid][0] + fx, forces[nid][1] + fy, forces[nid][2] + fz)
-        
-        # Apply forces with temperature limit
-        for nid in node_ids:
-            if nid not in positions:
-                continue
+        # Repulsion: exact all-pairs for small graphs, grid cutoff for large
+        if n >= GRID_REPULSION_MIN_NODES:
+            forces += _grid_repulsion_forces(pos, k_repulsion, REPULSION_CUTOFF)
+        else:
+            forces += _repulsion_forces(pos, k_repulsion)
 
-            # Keep ego pinned at center
-            if nid == ego_id:
-                positions[nid] = (0.0, 0.0, 0.0)
-                continue
+        # Attraction along edges (scatter-add handles repeated endpoints)
+        if len(edge_k):
+            edge_forces = edge_k[:, None] * (pos[edge_dst] - pos[edge_src])
+            np.add.at(forces, edge_src, edge_forces)
+            np.add.at(forces, edge_dst, -edge_forces)
+
+        # Community clustering toward centroid
+        if centroids is not None:
+            forces += k_community * (centroids - pos)
 
-            fx, fy, fz = forces[nid]
-            force_mag = math.sqrt(fx * fx + fy * fy + fz * fz) + 0.01
+        # Apply forces with temperature limit
+        force_mag = np.sqrt(np.einsum("ij,ij->i", forces, forces)) + 0.01
+        movement = np.minimum(force_mag, temperature)
 
-            # Limit movement by temperature
-            movement = min(force_mag, temperature)
+        # Keep ego pinned at center
+        if ego_index is not None:
+            movement[ego_index] = 0.0
 
-            x, y, z = positions[nid]
-            positions[nid] = (
-                x + (fx / force_mag) * movement,
-                y + (fy / force_mag) * movement,
-                z + (fz / force_mag) * movement
-            )
+        pos += forces * (movement / force_mag)[:, None]
+        if ego_index is not None:
+            pos[ego_index] = 0.0
 
         # Cool down
         temperature *= cooling_factor
 
+        # Converged: nothing is moving any more
+        max_displacement = movement.max() if n else 0.0
+        if max_displacement < convergence_threshold:
+            break
+
+    for nid, (x, y, z) in zip(node_ids, pos.tolist()):
+        positions[nid] = (x, y, z)
+
     # Ensure ego stays at center
     if ego_id:
         positions[ego_id] = (0.0, 0.0, 0.0)
@@ -712,6 +790,82 @@ def force_directed_layout(
     return positions
 
 
+# =============================================================================
+# Layout Reuse
+# =============================================================================
+
+def reusable_layout(
+    db: Session,
+    interval: Interval,
+    nodes: Dict[str, GraphNode],
+    edges: List[GraphEdge],
+    prev_positions: Dict[str, Tuple[float, float, float]]
+) -> Optional[Tuple[Dict[str, int], Dict[str, Tuple[float, float, float]]]]:
+    """
+    (communities, positions) saved for the previous interval when its frame
+    has exactly this node and edge set (edge type and stored weight
+    included), else None. Consecutive intervals often share a topology, and
+    re-running detection and layout for them would only nudge the nodes.
+
+    Everything read here is saved frame data, so a frame is reproducible
+    from the same inputs including the previous interval's saved frame;
+    what else was built earlier in the process does not matter.
+    """
+    if not prev_positions or prev_positions.keys() != nodes.keys():
+        return None
+
+    prev_interval_id = previous_interval_id(db, interval)
+    prev_communities = dict(db.query(Community.account_id, Community.community_id).filter(
+        Community.interval_id == prev_interval_id
+    ).all())
+    if prev_communities.keys() != nodes.keys():
+        return None
+
+    # Saved weights are rounded as in the frame payload; compare them that way
+    saved_edges = sorted(db.query(Edge.src_id, Edge.dst_id, Edge.edge_type, Edge.weight).filter(
+        Edge.interval_id == prev_interval_id
+    ).all())
+    edge_weights = np.round(
+        np.fromiter((e.weight for e in edges), dtype=np.float64, count=len(edges)), 4
+    ).tolist()
+    current_edges = sorted(
+        (e.src_id, e.dst_id, e.edge_type, weight) for e, weight in zip(edges, edge_weights)
+    )
+    if [tuple(row) for row in saved_edges] != current_edges:
+        return None
+
+    return prev_communities, dict(prev_positions)
+
+
+# =============================================================================
+# Pruning Helpers
+# =============================================================================
+
+def score_prefix(scores: np.ndarray, coverage: float, cap: int) -> np.ndarray:
+    """
+    Indices of the smallest highest-scored prefix covering `coverage` of
+    the total score, capped at `cap` entries. Ties keep input order.
+    """
+    n = len(scores)
+    limit = min(cap, n)
+    if limit <= 0:
+        return np.empty(0, dtype=np.intp)
+
+    # Only the top `limit` scores (plus boundary ties) need sorting
+    if limit < n:
+        threshold = np.partition(scores, n - limit)[n - limit]
+        candidates = np.flatnonzero(scores >= threshold)
+    else:
+        candidates = np.arange(n)
+    order = candidates[np.argsort(-scores[candidates], kind="stable")][:limit]
+
+    total = scores.sum()
+    if coverage < 1.0 and total > 0:
+        cumulative = np.cumsum(scores[order]) / total
+        return order[:int(np.searchsorted(cumulative, coverage)) + 1]
+    return order
+
+
 # =============================================================================
 # Frame Builder
 # =============================================================================
@@ -721,7 +875,21 @@ class FrameBuilder:
     
     def __init__(self, db: Session):
         self.db = db
-    
+        self._new_follower_cache: Dict[int, Set[str]] = {}
+
+    def _get_new_follower_ids(self, interval_id: int) -> Set[str]:
+        """Account ids that newly followed in an interval (cached per builder)."""
+        cached = self._new_follower_cache.get(interval_id)
+        if cached is None:
+            cached = {
+                account_id for (account_id,) in self.db.query(FollowEvent.account_id).filter(
+                    FollowEvent.interval_id == interval_id,
+                    FollowEvent.kind == "new"
+                )
+            }
+            self._new_follower_cache[interval_id] = cached
+        return cached
+
     def _empty_frame(
         self,
         timeframe_days: int = 30,
@@ -752,18 +920,11 @@ class FrameBuilder:
         account_ids: Set[str]
     ) -> Dict[str, GraphNode]:
         """Load account data for nodes."""
-        accounts = self.db.query(Account).filter(
-            Account.account_id.in_(account_ids)
-        ).all()
-        
+        accounts = iter_in_chunks(self.db.query(Account), Account.account_id, account_ids)
+
         # Get new followers in this interval
-        new_follower_ids = set(
-            fe.account_id for fe in self.db.query(FollowEvent).filter(
-                FollowEvent.interval_id == interval.interval_id,
-                FollowEvent.kind == "new"
-            ).all()
-        )
-        
+        new_follower_ids = self._get_new_follower_ids(interval.interval_id)
+
         nodes = {}
         for acc in accounts:
             nodes[acc.account_id] = GraphNode(
@@ -786,6 +947,9 @@ class FrameBuilder:
         Compute importance score for each node.
         Based on: edge weight sum + follower count (normalized).
         """
+        if len(nodes) >= VECTORIZE_MIN_NODES:
+            return self._compute_importance_vectorized(nodes, edges)
+
         edge_weights: Dict[str, float] = defaultdict(float)
         
         for edge in edges:
@@ -804,7 +968,38 @@ class FrameBuilder:
             importance[account_id] = 0.7 * edge_score + 0.3 * follower_score
         
         return importance
-    
+
+    def _compute_importance_vectorized(
+        self,
+        nodes: Dict[str, GraphNode],
+        edges: List[GraphEdge]
+    ) -> Dict[str, float]:
+        """NumPy version of compute_importance for larger graphs."""
+        account_ids = list(nodes)
+        n = len(account_ids)
+
+        # Edge endpoints outside the node set still count toward the max
+        index = {aid: i for i, aid in enumerate(account_ids)}
+        src = np.fromiter((index.setdefault(e.src_id, len(index)) for e in edges), dtype=np.int64, count=len(edges))
+        dst = np.fromiter((index.setdefault(e.dst_id, len(index)) for e in edges), dtype=np.int64, count=len(edges))
+        weights = np.fromiter((e.weight for e in edges), dtype=np.float64, count=len(edges))
+
+        edge_weights = np.zeros(len(index))
+        np.add.at(edge_weights, src, weights)
+        np.add.at(edge_weights, dst, weights)
+
+        # Normalize
+        max_edge_weight = edge_weights.max() if len(edges) else 1.0
+        followers = np.fromiter((node.followers_count for node in nodes.values()), dtype=np.float64, count=n)
+        max_followers = followers.max()
+        max_followers_log = math.log1p(max_followers) if max_followers > 0 else 1.0
+
+        importance = (
+            0.7 * edge_weights[:n] / max_edge_weight
+            + 0.3 * np.log1p(followers) / max_followers_log
+        )
+        return dict(zip(account_ids, importance.tolist()))
+
     def prune_graph(
         self,
         nodes: Dict[str, GraphNode],
@@ -812,11 +1007,17 @@ class FrameBuilder:
         max_nodes: int = MAX_NODES_RENDERED,
         max_edges: int = MAX_EDGES_RENDERED,
         max_edges_per_node: int = MAX_EDGES_PER_NODE,
-        min_followers: int = MIN_FOLLOWERS_FOR_DISPLAY
+        min_followers: int = MIN_FOLLOWERS_FOR_DISPLAY,
+        coverage: float = PRUNE_SCORE_COVERAGE
     ) -> Tuple[Dict[str, GraphNode], List[GraphEdge]]:
         """
         Prune graph to fit performance bounds.
-        First filter by minimum follower count, then keep top nodes by importance.
+        First filter by minimum follower count, then keep the top nodes by
+        importance until `coverage` of total importance is reached (never
+        more than max_nodes). Edges get the same treatment by weight.
+        The ego, new followers and edges touching the ego are what a frame
+        is about, so they are exempt from the coverage cut; only the caps
+        apply to them.
         """
         # Filter out very small accounts first (reduces initial lag)
         if min_followers > 0:
@@ -834,39 +1035,87 @@ class FrameBuilder:
             if account_id in nodes:
                 nodes[account_id].importance = imp
 
-        # Prune nodes
-        if len(nodes) > max_nodes:
-            sorted_nodes = sorted(nodes.items(), key=lambda x: -x[1].importance)
-            nodes = dict(sorted_nodes[:max_nodes])
+        # Prune nodes: exempt ones first (by score, up to the cap), then the
+        # coverage prefix of the rest, all kept in score order
+        if nodes:
+            items = list(nodes.items())
+            scores = np.fromiter((n.importance for _, n in items), dtype=np.float64, count=len(items))
+            exempt = np.fromiter(
+                (bool(n.is_ego or n.is_new) for _, n in items), dtype=bool, count=len(items)
+            )
+            kept = np.flatnonzero(exempt)
+            kept = kept[score_prefix(scores[kept], 1.0, max_nodes)]
+            rest = np.flatnonzero(~exempt)
+            rest = rest[score_prefix(scores[rest], coverage, max_nodes - len(kept))]
+            top = np.concatenate([kept, rest])
+            if len(top) < len(items):
+                top = top[np.argsort(-scores[top], kind="stable")]
+                nodes = dict(items[i] for i in top.tolist())
         
         # Filter edges to only include kept nodes
         node_ids = set(nodes.keys())
         edges = [e for e in edges if e.src_id in node_ids and e.dst_id in node_ids]
+
+        # Edges touching the ego bypass both edge cuts (up to the global cap)
+        ego_ids = {aid for aid, n in nodes.items() if n.is_ego}
+        ego_edges = [e for e in edges if e.src_id in ego_ids or e.dst_id in ego_ids][:max_edges]
+        if ego_edges:
+            edges = [e for e in edges if e.src_id not in ego_ids and e.dst_id not in ego_ids]
         
         # Prune edges per node
-        edge_by_node: Dict[str, List[GraphEdge]] = defaultdict(list)
-        for edge in edges:
-            edge_by_node[edge.src_id].append(edge)
-            edge_by_node[edge.dst_id].append(edge)
-        
-        kept_edges: Set[Tuple[str, str, str]] = set()
-        for node_id, node_edges in edge_by_node.items():
-            # Keep top edges by weight
-            sorted_edges = sorted(node_edges, key=lambda e: -e.weight)
-            for edge in sorted_edges[:max_edges_per_node]:
-                key = (min(edge.src_id, edge.dst_id), max(edge.src_id, edge.dst_id), edge.edge_type)
-                kept_edges.add(key)
-        
-        edges = [
-            e for e in edges
-            if (min(e.src_id, e.dst_id), max(e.src_id, e.dst_id), e.edge_type) in kept_edges
-        ]
-        
+        edges = self._prune_edges_per_node(edges, max_edges_per_node)
+
         # Global edge cap
-        if len(edges) > max_edges:
-            edges = sorted(edges, key=lambda e: -e.weight)[:max_edges]
-        
-        return nodes, edges
+        if edges:
+            weights = np.fromiter((e.weight for e in edges), dtype=np.float64, count=len(edges))
+            top = score_prefix(weights, coverage, max_edges - len(ego_edges))
+            if len(top) < len(edges):
+                edges = [edges[i] for i in top.tolist()]
+
+        return nodes, ego_edges + edges
+
+    def _prune_edges_per_node(
+        self,
+        edges: List[GraphEdge],
+        max_edges_per_node: int
+    ) -> List[GraphEdge]:
+        """
+        Keep each node's top edges by weight.
+
+        An edge (and any duplicate sharing its undirected key and type)
+        survives if it ranks in the top max_edges_per_node for either of
+        its endpoints. Ranking is a single lexsort over endpoint arrays.
+        """
+        if not edges:
+            return edges
+
+        node_index: Dict[str, int] = {}
+        canon_index: Dict[Tuple[str, str, str], int] = {}
+        src_ix, dst_ix, canon_ix = [], [], []
+        for e in edges:
+            src_ix.append(node_index.setdefault(e.src_id, len(node_index)))
+            dst_ix.append(node_index.setdefault(e.dst_id, len(node_index)))
+            canon_ix.append(canon_index.setdefault(e.canon_key, len(canon_index)))
+        canon = np.array(canon_ix, dtype=np.int64)
+        weights = np.fromiter((e.weight for e in edges), dtype=np.float64, count=len(edges))
+
+        # Each edge is listed once under each endpoint; ties keep edge order
+        edge_count = len(edges)
+        endpoint = np.array(src_ix + dst_ix, dtype=np.int64)
+        edge_ix = np.tile(np.arange(edge_count), 2)
+        order = np.lexsort((edge_ix, -np.tile(weights, 2), endpoint))
+
+        # Rank of every entry within its endpoint's run
+        sorted_endpoint = endpoint[order]
+        run_start = np.flatnonzero(np.r_[True, sorted_endpoint[1:] != sorted_endpoint[:-1]])
+        run_length = np.diff(np.r_[run_start, len(order)])
+        rank = np.arange(len(order)) - np.repeat(run_start, run_length)
+
+        kept_canon = np.zeros(len(canon_index), dtype=bool)
+        kept_canon[canon[edge_ix[order[rank < max_edges_per_node]]]] = True
+        keep = kept_canon[canon].tolist()
+
+        return [e for e, kept in zip(edges, keep) if kept]
     
     def build_frame(
         self,
@@ -884,8 +1133,6 @@ class FrameBuilder:
 
         The goal: See who you followed first that led to others following them.
         """
-        from .models import Snapshot, SnapshotFollower, SnapshotFollowing
-
         if not interval:
             logger.warning("build_frame called with None interval")
             return self._empty_frame(timeframe_days)
@@ -895,27 +1142,39 @@ class FrameBuilder:
             logger.warning(f"Interval {interval.interval_id} has no end_at")
             reference_time = utc_now()
 
-        # Get followers (people who follow YOU) up to this time
-        follower_snapshots = self.db.query(Snapshot).filter(
-            Snapshot.kind == "followers",
+        # Cheap probe before the snapshot queries: early intervals in a
+        # replay often predate every snapshot. Without an ego such a frame
+        # is empty; with one it is the ego alone, so only the queries are skipped
+        has_snapshots = self.db.query(Snapshot.snapshot_id).filter(
             Snapshot.captured_at <= reference_time
-        ).order_by(Snapshot.captured_at.asc()).all()
+        ).limit(1).scalar() is not None
+        if not has_snapshots and not ego_id:
+            logger.info(f"No snapshots yet for interval {interval.interval_id}")
+            return self._empty_frame(timeframe_days, interval)
 
         follower_ids: Set[str] = set()
-        for snap in follower_snapshots:
-            for sf in snap.followers:
-                follower_ids.add(sf.account_id)
-
-        # Get following (people YOU follow) up to this time
-        following_snapshots = self.db.query(Snapshot).filter(
-            Snapshot.kind == "following",
-            Snapshot.captured_at <= reference_time
-        ).order_by(Snapshot.captured_at.asc()).all()
-
         following_ids: Set[str] = set()
-        for snap in following_snapshots:
-            for sf in snap.following:
-                following_ids.add(sf.account_id)
+        if has_snapshots:
+            # Get followers (people who follow YOU) up to this time
+            # One joined DISTINCT query instead of a lazy load per snapshot
+            follower_ids = {
+                account_id for (account_id,) in self.db.query(SnapshotFollower.account_id).join(
+                    Snapshot, SnapshotFollower.snapshot_id == Snapshot.snapshot_id
+                ).filter(
+                    Snapshot.kind == "followers",
+                    Snapshot.captured_at <= reference_time
+                ).distinct()
+            }
+
+            # Get following (people YOU follow) up to this time
+            following_ids = {
+                account_id for (account_id,) in self.db.query(SnapshotFollowing.account_id).join(
+                    Snapshot, SnapshotFollowing.snapshot_id == Snapshot.snapshot_id
+                ).filter(
+                    Snapshot.kind == "following",
+                    Snapshot.captured_at <= reference_time
+                ).distinct()
+            }
 
         # Calculate relationship types
         mutual_ids = follower_ids & following_ids
@@ -927,11 +1186,7 @@ class FrameBuilder:
         # Get new followers in THIS interval (for highlighting)
         new_follower_ids: Set[str] = set()
         try:
-            new_followers = self.db.query(FollowEvent).filter(
-                FollowEvent.interval_id == interval.interval_id,
-                FollowEvent.kind == "new"
-            ).all()
-            new_follower_ids = {fe.account_id for fe in new_followers}
+            new_follower_ids = self._get_new_follower_ids(interval.interval_id)
         except Exception as e:
             logger.error(f"Failed to query follow events: {e}")
 
@@ -956,21 +1211,20 @@ class FrameBuilder:
         # Prune nodes first (before adding ego edges)
         nodes, all_edges = self.prune_graph(nodes, all_edges)
 
-        # After pruning, recalculate which IDs remain
-        remaining_ids = set(nodes.keys())
-        remaining_followers = follower_ids & remaining_ids
-        remaining_following = following_ids & remaining_ids
-        remaining_mutual = mutual_ids & remaining_ids
+        # After pruning, index the remaining IDs once; relationship checks
+        # below become flag lookups by position instead of set probes
+        remaining = list(nodes)
+        remaining_ids = set(remaining)
 
         # Add network edges (connections BETWEEN accounts in your network)
         # This creates the routing/topology instead of starburst
-        from .models import NetworkConnection
+        # (only remaining ids are visited, so the full sets can be passed)
         network_edges = self._build_network_edges(
             remaining_ids,
             ego_id,
-            mutual_ids=remaining_mutual,
-            follower_ids=remaining_followers,
-            following_ids=remaining_following
+            mutual_ids=mutual_ids,
+            follower_ids=follower_ids,
+            following_ids=following_ids
         )
         all_edges.extend(network_edges)
         logger.info(f"Added {len(network_edges)} network edges between accounts")
@@ -999,48 +1253,53 @@ class FrameBuilder:
                 accounts_with_network_edges.add(edge.src_id)
                 accounts_with_network_edges.add(edge.dst_id)
 
+            n_remaining = len(remaining)
+            is_mutual = np.fromiter((aid in mutual_ids for aid in remaining), dtype=bool, count=n_remaining)
+            is_following = np.fromiter((aid in following_ids for aid in remaining), dtype=bool, count=n_remaining)
+            is_follower = np.fromiter((aid in follower_ids for aid in remaining), dtype=bool, count=n_remaining)
+            has_network = np.fromiter(
+                (aid in accounts_with_network_edges for aid in remaining), dtype=bool, count=n_remaining
+            )
+            not_ego = np.fromiter((aid != ego_id for aid in remaining), dtype=bool, count=n_remaining)
+
             # First: ALL mutuals ALWAYS get a mutual edge to ego
             # (This includes hub mutuals that also have network edges)
-            for account_id in remaining_mutual:
-                if account_id == ego_id:
-                    continue
+            for i in np.flatnonzero(is_mutual & not_ego).tolist():
                 ego_edges.append(GraphEdge(
                     src_id=ego_id,
-                    dst_id=account_id,
+                    dst_id=remaining[i],
                     edge_type="mutual",
                     weight=1.0
                 ))
 
             # Second: Non-mutuals WITHOUT network connections get direct ego edges
             # (This is the fallback for isolated nodes that couldn't route through mutuals)
-            for account_id in remaining_ids:
-                if account_id == ego_id:
-                    continue
-                if account_id in remaining_mutual:
-                    continue  # Already handled above
-                if account_id in accounts_with_network_edges:
-                    continue  # Has network routing, no need for direct edge
-
-                if account_id in remaining_following:
-                    ego_edges.append(GraphEdge(
-                        src_id=ego_id,
-                        dst_id=account_id,
-                        edge_type="you_follow",
-                        weight=0.8
-                    ))
-                elif account_id in remaining_followers:
-                    ego_edges.append(GraphEdge(
-                        src_id=account_id,
-                        dst_id=ego_id,
-                        edge_type="followers_you",
-                        weight=0.6
-                    ))
+            unrouted = not_ego & ~is_mutual & ~has_network
+            for i in np.flatnonzero(unrouted & is_following).tolist():
+                ego_edges.append(GraphEdge(
+                    src_id=ego_id,
+                    dst_id=remaining[i],
+                    edge_type="you_follow",
+                    weight=0.8
+                ))
+            for i in np.flatnonzero(unrouted & ~is_following & is_follower).tolist():
+                ego_edges.append(GraphEdge(
+                    src_id=remaining[i],
+                    dst_id=ego_id,
+                    edge_type="followers_you",
+                    weight=0.6
+                ))
 
             all_edges = ego_edges + all_edges
             logger.info(f"Added {len(ego_edges)} direct ego edges for unconnected accounts")
 
-        # Community detection
-        communities = simple_community_detection(list(nodes.values()), all_edges)
+        # An unchanged topology keeps the previous interval's saved layout
+        prev_positions = previous_positions(self.db, interval)
+        reused_layout = reusable_layout(self.db, interval, nodes, all_edges, prev_positions)
+        if reused_layout is not None:
+            communities, positions = reused_layout
+        else:
+            communities = simple_community_detection(list(nodes.values()), all_edges)
 
         # Update nodes with community (ego gets community 0)
         for account_id, community_id in communities.items():
@@ -1050,9 +1309,11 @@ class FrameBuilder:
             nodes[ego_id].community_id = 0
 
         # Compute positions (ego pinned at center)
-        positions = compute_positions(
-            self.db, interval, list(nodes.values()), all_edges, communities, ego_id
-        )
+        if reused_layout is None:
+            positions = compute_positions(
+                self.db, interval, list(nodes.values()), all_edges, communities, ego_id,
+                prev_positions=prev_positions
+            )
 
         # Update nodes with positions
         for account_id, (x, y, z) in positions.items():
@@ -1061,44 +1322,62 @@ class FrameBuilder:
                 nodes[account_id].y = y
                 nodes[account_id].z = z
 
+        # Round scores, coordinates and weights in one vectorized pass each
+        node_list = list(nodes.values())
+        coords = np.round(
+            np.array([(n.x, n.y, n.z) for n in node_list], dtype=np.float64).reshape(-1, 3), 2
+        ).tolist()
+        importances = np.round(
+            np.fromiter((n.importance for n in node_list), dtype=np.float64, count=len(node_list)), 4
+        ).tolist()
+        edge_weights = np.round(
+            np.fromiter((e.weight for e in all_edges), dtype=np.float64, count=len(all_edges)), 4
+        ).tolist()
+
+        # Serialize nodes in a single pass, counting new followers as we go
+        nodes_json = []
+        new_count = 0
+        for n, (x, y, z), importance in zip(node_list, coords, importances):
+            if n.is_new:
+                new_count += 1
+            nodes_json.append({
+                "id": n.account_id,
+                "handle": n.handle,
+                "name": n.name,
+                "avatar": n.avatar_url,
+                "followers": n.followers_count,
+                "importance": importance,
+                "community": n.community_id,
+                "x": x,
+                "y": y,
+                "z": z,
+                "isNew": n.is_new,
+                "isEgo": n.is_ego
+            })
+        community_set = set(communities.values())
+
         # Build frame JSON
         frame_data = {
             "interval_id": interval.interval_id,
             "timeframe_days": timeframe_days,
             "timestamp": reference_time.isoformat(),
             "ego_id": ego_id,
-            "nodes": [
-                {
-                    "id": n.account_id,
-                    "handle": n.handle,
-                    "name": n.name,
-                    "avatar": n.avatar_url,
-                    "followers": n.followers_count,
-                    "importance": round(n.importance, 4),
-                    "community": n.community_id,
-                    "x": round(n.x, 2),
-                    "y": round(n.y, 2),
-                    "z": round(n.z, 2),
-                    "isNew": n.is_new,
-                    "isEgo": n.is_ego
-                }
-                for n in nodes.values()
-            ],
+            "nodes": nodes_json,
             "edges": [
                 {
                     "source": e.src_id,
                     "target": e.dst_id,
                     "type": e.edge_type,
-                    "weight": round(e.weight, 4)
+                    "weight": weight
                 }
-                for e in all_edges
+                for e, weight in zip(all_edges, edge_weights)
             ],
-            "communities": list(set(communities.values())),
+            "communities": list(community_set),
             "stats": {
                 "nodeCount": len(nodes),
                 "edgeCount": len(all_edges),
-                "communityCount": len(set(communities.values())),
-                "newFollowers": len([n for n in nodes.values() if n.is_new])
+                "communityCount": len(community_set),
+                "newFollowers": new_count
             }
         }
 
@@ -1112,9 +1391,7 @@ class FrameBuilder:
         ego_id: str = None
     ) -> Dict[str, GraphNode]:
         """Load account data for nodes, marking which are new in this interval."""
-        accounts = self.db.query(Account).filter(
-            Account.account_id.in_(account_ids)
-        ).all()
+        accounts = iter_in_chunks(self.db.query(Account), Account.account_id, account_ids)
 
         nodes = {}
         for acc in accounts:
@@ -1139,63 +1416,81 @@ class FrameBuilder:
         timeframe_window: int = 30
     ) -> Frame:
         """Save computed frame to database."""
-        # Delete existing data for this interval to allow rebuilds
-        self.db.query(Edge).filter(Edge.interval_id == interval.interval_id).delete()
-        self.db.query(Community).filter(Community.interval_id == interval.interval_id).delete()
-        self.db.query(Position).filter(Position.interval_id == interval.interval_id).delete()
-        self.db.query(Frame).filter(Frame.interval_id == interval.interval_id).delete()
-        self.db.commit()
-
-        # Store edges
-        for edge_data in frame_data["edges"]:
-            edge = Edge(
-                interval_id=interval.interval_id,
-                src_id=edge_data["source"],
-                dst_id=edge_data["target"],
-                edge_type=edge_data["type"],
-                weight=edge_data["weight"]
+        interval_id = interval.interval_id
+
+        # Delete existing data for this interval to allow rebuilds; plain
+        # DELETEs, no need to load or sync the old rows in the session
+        for model in (Edge, Community, Position, Frame):
+            self.db.execute(
+                delete(model).where(model.interval_id == interval_id),
+                execution_options={"synchronize_session": False}
             )
-            self.db.add(edge)
-        
-        # Store communities
+
+        # Store edges, communities, positions and history as one
+        # executemany per table rather than one ORM instance per row
+        edge_rows = [
+            {
+                "interval_id": interval_id,
+                "src_id": edge_data["source"],
+                "dst_id": edge_data["target"],
+                "edge_type": edge_data["type"],
+                "weight": edge_data["weight"]
+            }
+            for edge_data in frame_data["edges"]
+        ]
+
+        community_rows = []
+        position_rows = []
+        history_rows = []
         for node_data in frame_data["nodes"]:
-            community = Community(
-                interval_id=interval.interval_id,
-                account_id=node_data["id"],
-                community_id=node_data["community"]
-            )
-            self.db.add(community)
-            
-            # Store position
-            position = Position(
-                interval_id=interval.interval_id,
-                account_id=node_data["id"],
-                x=node_data["x"],
-                y=node_data["y"],
-                z=node_data["z"]
-            )
-            self.db.add(position)
-            
+            account_id = node_data["id"]
+            x, y, z = float(node_data["x"]), float(node_data["y"]), float(node_data["z"])
+            community_rows.append({
+                "interval_id": interval_id,
+                "account_id": account_id,
+                "community_id": node_data["community"]
+            })
+            position_rows.append({
+                "interval_id": interval_id,
+                "account_id": account_id,
+                "x": x,
+                "y": y,
+                "z": z
+            })
             # Also store to position history for stable timeline replay
-            position_history = PositionHistory(
-                interval_id=interval.interval_id,
-                account_id=node_data["id"],
-                x=node_data["x"],
-                y=node_data["y"],
-                z=node_data["z"],
-                source="frame_build"
-            )
-            self.db.add(position_history)
-        
-        # Store frame
+            history_rows.append({
+                "interval_id": interval_id,
+                "account_id": account_id,
+                "x": x,
+                "y": y,
+                "z": z,
+                "source": "frame_build"
+            })
+
+        self.db.bulk_insert_mappings(Edge, edge_rows)
+        self.db.bulk_insert_mappings(Community, community_rows)
+        self.db.bulk_insert_mappings(Position, position_rows)
+        self.db.bulk_insert_mappings(PositionHistory, history_rows)
+
+        # Store frame. Edges, positions and communities are already rows,
+        # so frame_json only keeps the summary plus the per-node fields no
+        # table holds; get_frame reassembles the full payload.
+        summary = {k: v for k, v in frame_data.items() if k not in ("nodes", "edges")}
+        summary["nodeMeta"] = {
+            n["id"]: [
+                n.get("handle"), n.get("name"), n.get("avatar"),
+                n.get("followers", 0), n.get("importance", 0.0), n.get("isNew", False)
+            ]
+            for n in frame_data["nodes"]
+        }
         frame = Frame(
             interval_id=interval.interval_id,
             timeframe_window=timeframe_window,
-            frame_json=json.dumps(frame_data),
+            frame_json=jsonutil.dumps(summary),
             node_count=frame_data["stats"]["nodeCount"],
             edge_count=frame_data["stats"]["edgeCount"],
-            build_meta_json=json.dumps({
-                "version": "1.0.0",
+            build_meta_json=jsonutil.dumps({
+                "version": "1.1.0",
                 "built_at": utc_now().isoformat()
             })
         )
@@ -1226,78 +1521,87 @@ class FrameBuilder:
         """
         edges = []
 
-        # Get account data
-        accounts = self.db.query(Account).filter(
-            Account.account_id.in_(account_ids)
-        ).all()
-        account_map = {a.account_id: a for a in accounts}
+        # Only follower counts are needed, so skip full ORM hydration
+        follower_counts: Dict[str, int] = {
+            account_id: followers_count or 0
+            for account_id, followers_count in iter_in_chunks(
+                self.db.query(Account.account_id, Account.followers_count),
+                Account.account_id,
+                account_ids
+            )
+        }
 
-        # Classify all accounts into tiers
-        tier_buckets: Dict[int, List[str]] = defaultdict(list)
+        # Classify all accounts into tiers in one scan. Buckets hold
+        # (followers, id) tuples so they sort without a key function.
+        tier_buckets: Dict[int, List[Tuple[int, str]]] = defaultdict(list)
         account_tiers: Dict[str, int] = {}
 
-        for aid in account_ids:
+        for aid, fc in follower_counts.items():
             if aid == ego_id:
                 continue
-            acc = account_map.get(aid)
-            if not acc:
-                continue
-            tier = classify_follower_tier(acc.followers_count or 0)
-            tier_buckets[tier].append(aid)
+            tier = classify_follower_tier(fc)
+            tier_buckets[tier].append((fc, aid))
             account_tiers[aid] = tier
 
         # Sort each tier bucket by follower count (descending)
-        for tier in tier_buckets:
-            tier_buckets[tier].sort(
-                key=lambda x: account_map.get(x, Account()).followers_count or 0,
-                reverse=True
-            )
+        for bucket in tier_buckets.values():
+            bucket.sort(reverse=True)
 
         # Log tier distribution
         tier_counts = {t: len(ids) for t, ids in tier_buckets.items()}
         logger.info(f"Tier distribution: {tier_counts}")
 
+        # Ascending follower counts per tier for bisecting to the nearest match
+        tier_sorted_ids: Dict[int, List[str]] = {}
+        tier_sorted_fc: Dict[int, List[int]] = {}
+        for tier, bucket in tier_buckets.items():
+            tier_sorted_ids[tier] = [aid for _, aid in reversed(bucket)]
+            tier_sorted_fc[tier] = [fc or 1 for fc, _ in reversed(bucket)]
+
         def find_nearest_in_tier(account_id: str, target_tier: int) -> Optional[str]:
             """Find nearest account in target tier by follower count similarity."""
-            candidates = tier_buckets.get(target_tier, [])
-            if not candidates:
+            counts = tier_sorted_fc.get(target_tier)
+            if not counts:
                 return None
-
-            acc = account_map.get(account_id)
-            if not acc:
-                return candidates[0] if candidates else None
-
-            acc_followers = acc.followers_count or 1
-            best_match = None
-            best_ratio = float('inf')
-
-            # Check top candidates in tier (limit for performance)
-            for cid in candidates[:50]:
-                c_acc = account_map.get(cid)
-                if not c_acc:
-                    continue
-                c_followers = c_acc.followers_count or 1
-                # Ratio of larger to smaller - closer to 1 is better match
-                ratio = max(acc_followers, c_followers) / max(min(acc_followers, c_followers), 1)
-                if ratio < best_ratio:
-                    best_ratio = ratio
-                    best_match = cid
-
-            return best_match or (candidates[0] if candidates else None)
+            ids = tier_sorted_ids[target_tier]
+
+            if account_id not in follower_counts:
+                return ids[-1]
+
+            acc_followers = follower_counts[account_id] or 1
+            i = bisect_left(counts, acc_followers)
+            if i == len(counts):
+                return ids[bisect_left(counts, counts[-1])]
+            if i == 0:
+                return ids[0]
+
+            # Ratio of larger to smaller - closer to 1 is better match
+            below = counts[i - 1]
+            if acc_followers / below < counts[i] / acc_followers:
+                return ids[bisect_left(counts, below)]
+            return ids[i]
+
+        # Closest non-empty tier above each tier, so skip-level fallbacks
+        # jump straight there instead of probing tier by tier
+        nonempty_above: Dict[int, Optional[int]] = {}
+        closest = None
+        for tier in range(1, 7):
+            nonempty_above[tier] = closest
+            if tier_buckets.get(tier):
+                closest = tier
 
         def find_any_higher_tier(account_id: str, current_tier: int) -> Optional[tuple]:
-            """Find any account in a higher tier, searching upward."""
-            for search_tier in range(current_tier - 1, 0, -1):
-                target = find_nearest_in_tier(account_id, search_tier)
-                if target:
-                    return (target, search_tier)
-            return None
+            """Find the nearest account in the closest non-empty higher tier."""
+            search_tier = nonempty_above.get(current_tier)
+            if search_tier is None:
+                return None
+            return (find_nearest_in_tier(account_id, search_tier), search_tier)
 
         # Build hierarchical edges from lowest tier to highest
         for tier in range(6, 0, -1):
             accounts_in_tier = tier_buckets.get(tier, [])
 
-            for aid in accounts_in_tier:
+            for _, aid in accounts_in_tier:
                 # Mutuals are handled separately (connect to ego)
                 if mutual_ids and aid in mutual_ids:
                     continue
@@ -1378,6 +1682,50 @@ class FrameBuilder:
         frame = query.order_by(Frame.created_at.desc()).first()
         
         if frame:
-            return json.loads(frame.frame_json)
+            frame_data = jsonutil.loads(frame.frame_json)
+            if "nodes" not in frame_data:
+                self._load_frame_graph(frame_data, frame.interval_id)
+            return frame_data
         
         return None
+
+    def _load_frame_graph(self, frame_data: dict, interval_id: int) -> None:
+        """Rebuild a summary frame's nodes and edges from the interval's rows."""
+        node_meta = frame_data.pop("nodeMeta", {})
+        ego_id = frame_data.get("ego_id")
+
+        communities = dict(
+            self.db.query(Community.account_id, Community.community_id).filter(
+                Community.interval_id == interval_id
+            )
+        )
+
+        nodes_json = []
+        for account_id, x, y, z in self.db.query(
+            Position.account_id, Position.x, Position.y, Position.z
+        ).filter(Position.interval_id == interval_id).order_by(Position.id):
+            handle, name, avatar, followers, importance, is_new = node_meta.get(
+                account_id, (None, None, None, 0, 0.0, False)
+            )
+            nodes_json.append({
+                "id": account_id,
+                "handle": handle,
+                "name": name,
+                "avatar": avatar,
+                "followers": followers,
+                "importance": importance,
+                "community": communities.get(account_id, 0),
+                "x": x,
+                "y": y,
+                "z": z,
+                "isNew": is_new,
+                "isEgo": account_id == ego_id
+            })
+        frame_data["nodes"] = nodes_json
+
+        frame_data["edges"] = [
+            {"source": src_id, "target": dst_id, "type": edge_type, "weight": weight}
+            for src_id, dst_id, edge_type, weight in self.db.query(
+                Edge.src_id, Edge.dst_id, Edge.edge_type, Edge.weight
+            ).filter(Edge.interval_id == interval_id).order_by(Edge.id)
+        ]
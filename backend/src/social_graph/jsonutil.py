@@ -0,0 +1,38 @@
+"""JSON encoding helpers - use orjson when installed, stdlib json otherwise."""
+import json
+
+try:
+    import orjson
+except ImportError:  # orjson is an optional speedup
+    orjson = None
+
+if orjson is not None:
+    _ORJSON_OPTIONS = orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_NON_STR_KEYS
+    _ORJSON_SORTED_OPTIONS = _ORJSON_OPTIONS | orjson.OPT_SORT_KEYS
+    JSONDecodeError = orjson.JSONDecodeError  # subclass of json.JSONDecodeError
+else:
+    JSONDecodeError = json.JSONDecodeError
+
+
+def dumps(obj, sort_keys: bool = False) -> str:
+    """Serialize to a compact JSON string."""
+    if orjson is not None:
+        options = _ORJSON_SORTED_OPTIONS if sort_keys else _ORJSON_OPTIONS
+        return orjson.dumps(obj, option=options).decode()
+    # ensure_ascii=False matches orjson's output byte for byte on plain data
+    return json.dumps(obj, separators=(",", ":"), sort_keys=sort_keys, ensure_ascii=False)
+
+
+def dumpb(obj, sort_keys: bool = False) -> bytes:
+    """Serialize to compact JSON bytes, for hashing or writing without a str round trip."""
+    if orjson is not None:
+        options = _ORJSON_SORTED_OPTIONS if sort_keys else _ORJSON_OPTIONS
+        return orjson.dumps(obj, option=options)
+    return dumps(obj, sort_keys=sort_keys).encode()
+
+
+def loads(data):
+    """Parse JSON from str or bytes."""
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
@@ -1,16 +1,20 @@
 """Mock post overlay data for M3 previews."""
 from __future__ import annotations
 
-import json
 import random
 from dataclasses import dataclass
 from datetime import datetime, timedelta
+from functools import lru_cache
 from typing import Iterable
 
+import numpy as np
 from sqlalchemy.orm import Session
 
 from .models import Account, Interval, Community, Post, PostAttribution
 from .models import utc_now
+from .database import dialect_insert, upsert_rows
+from . import jsonutil
+from .post_attribution import encode_payload, invalidate_post_attribution_cache
 
 
 POST_SNIPPETS = [
@@ -24,6 +28,11 @@ POST_SNIPPETS = [
     "Focusing on high-signal posts to cut the long tail.",
 ]
 
+MOCK_AUTHOR_ID = "mock_author"
+
+# Rows upserted per statement when seeding
+SEED_BATCH_SIZE = 500
+
 EVIDENCE_POOL = [
     "Direct engagement within 24h window",
     "Follower delta spike in next interval",
@@ -41,21 +50,22 @@ def _ensure_mock_accounts(db: Session, target: int = 80) -> None:
     needed = target - existing_count
     start_index = existing_count + 1
 
-    for index in range(needed):
-        account_id = f"mock_user_{start_index + index}"
-        exists = db.query(Account).filter(Account.account_id == account_id).first()
-        if exists:
-            continue
-        db.add(Account(
-            account_id=account_id,
-            handle=f"mockuser{start_index + index}",
-            name=f"Mock User {start_index + index}",
-            avatar_url=None,
-            bio="Synthetic account for mock attribution previews.",
-            followers_count=0,
-            following_count=0,
-            tweet_count=0,
-        ))
+    # Ids continue from the account count, so they are new unless accounts
+    # were removed since an earlier seed; let the database skip those
+    rows = [
+        {
+            "account_id": f"mock_user_{index}",
+            "handle": f"mockuser{index}",
+            "name": f"Mock User {index}",
+            "avatar_url": None,
+            "bio": "Synthetic account for mock attribution previews.",
+            "followers_count": 0,
+            "following_count": 0,
+            "tweet_count": 0,
+        }
+        for index in range(start_index, start_index + needed)
+    ]
+    db.execute(dialect_insert(db, Account).on_conflict_do_nothing(), rows)
     db.flush()
 
 
@@ -93,13 +103,39 @@ def _ensure_intervals(db: Session, limit: int) -> list[IntervalLike]:
 def _pick_unique(items: list[str], count: int, rng: random.Random) -> list[str]:
     if count <= 0 or not items:
         return []
-    count = min(count, len(items))
-    indices = rng.sample(range(len(items)), count)
+    total = len(items)
+    count = min(count, total)
+    # Floyd's sampling: O(count) work and memory whatever the pool size
+    selected: set[int] = set()
+    indices: list[int] = []
+    for upper in range(total - count, total):
+        index = rng.randrange(upper + 1)
+        if index in selected:
+            index = upper
+        selected.add(index)
+        indices.append(index)
     return [items[index] for index in indices]
 
 
+@lru_cache(maxsize=256)
+def _pick_evidence(interval_id: int, post_index: int, count: int) -> tuple[str, ...]:
+    # Seeded by post identity alone so repeated previews hit the cache
+    rng = random.Random(interval_id * 101 + post_index * 37)
+    return tuple(_pick_unique(EVIDENCE_POOL, count, rng))
+
+
+def _load_community_map(db: Session, interval_ids: Iterable[int]) -> dict[int, dict[str, int]]:
+    community_map: dict[int, dict[str, int]] = {}
+    rows = db.query(
+        Community.interval_id, Community.account_id, Community.community_id
+    ).filter(Community.interval_id.in_(list(interval_ids)))
+    for interval_id, account_id, community_id in rows:
+        community_map.setdefault(interval_id, {})[account_id] = community_id
+    return community_map
+
+
 def _community_ids_for_accounts(
-    db: Session,
+    community_map: dict[int, dict[str, int]],
     interval_id: int,
     account_ids: Iterable[str],
 ) -> list[int]:
@@ -107,18 +143,28 @@ def _community_ids_for_accounts(
     if not account_ids:
         return []
 
-    communities = db.query(Community).filter(
-        Community.interval_id == interval_id,
-        Community.account_id.in_(account_ids),
-    ).all()
+    interval_communities = community_map.get(interval_id, {})
+    community_ids = {
+        interval_communities[account_id]
+        for account_id in account_ids
+        if account_id in interval_communities
+    }
+    if community_ids:
+        return sorted(community_ids)
 
-    if communities:
-        return sorted({community.community_id for community in communities})
+    return _fallback_community_ids(account_ids)
 
-    fallback_ids = {
-        sum(ord(char) for char in account_id) % 5 for account_id in account_ids
-    }
-    return sorted(fallback_ids)
+
+def _fallback_community_ids(account_ids: list[str]) -> list[int]:
+    # Sum of code points per id, mod 5, computed over one joined buffer
+    lengths = np.fromiter(map(len, account_ids), dtype=np.int64, count=len(account_ids))
+    codes = np.frombuffer("".join(account_ids).encode("utf-32-le"), dtype=np.uint32)
+    sums = np.zeros(len(account_ids), dtype=np.int64)
+    nonempty = lengths > 0
+    if codes.size:
+        starts = np.cumsum(lengths) - lengths
+        sums[nonempty] = np.add.reduceat(codes.astype(np.int64), starts[nonempty])
+    return sorted(set((sums % 5).tolist()))
 
 
 def generate_mock_posts(
@@ -126,11 +172,19 @@ def generate_mock_posts(
     timeframe_window: int,
     limit: int,
 ) -> list[dict]:
+    return [post for _, post in _generate_timed_mock_posts(db, timeframe_window, limit)]
+
+
+def _generate_timed_mock_posts(
+    db: Session,
+    timeframe_window: int,
+    limit: int,
+) -> list[tuple[datetime, dict]]:
     intervals = _ensure_intervals(db, limit)
-    accounts = db.query(Account).limit(500).all()
-    account_ids = [account.account_id for account in accounts]
+    account_ids = [account_id for (account_id,) in db.query(Account.account_id).limit(500)]
+    community_map = _load_community_map(db, (interval.interval_id for interval in intervals))
 
-    posts: list[dict] = []
+    posts: list[tuple[datetime, dict]] = []
 
     for index, interval in enumerate(intervals):
         seed_base = interval.interval_id * 101 + index * 17
@@ -140,37 +194,37 @@ def generate_mock_posts(
             continue
 
         post_count = 1 + (1 if rng.random() > 0.7 else 0)
+        # Posts draw from the interval's generator; seeding a fresh
+        # Random per post cost more than all of the post's draws
         for post_index in range(post_count):
-            post_seed = seed_base + post_index * 37
-            post_rng = random.Random(post_seed)
-
             snippet = POST_SNIPPETS[(interval.interval_id + post_index) % len(POST_SNIPPETS)]
-            total_attributed = 6 + post_rng.randint(0, 14)
+            total_attributed = 6 + rng.randint(0, 14)
             if account_ids:
                 total_attributed = min(total_attributed, len(account_ids))
             else:
                 total_attributed = 0
 
-            high = max(1, int(total_attributed * (0.35 + post_rng.random() * 0.15))) if total_attributed else 0
-            medium = max(1, int(total_attributed * (0.35 + post_rng.random() * 0.15))) if total_attributed else 0
+            high = max(1, int(total_attributed * (0.35 + rng.random() * 0.15))) if total_attributed else 0
+            medium = max(1, int(total_attributed * (0.35 + rng.random() * 0.15))) if total_attributed else 0
             low = max(total_attributed - high - medium, 0)
 
-            attributed_ids = _pick_unique(account_ids, total_attributed, post_rng)
-            community_ids = _community_ids_for_accounts(db, interval.interval_id, attributed_ids)
-            evidence = _pick_unique(EVIDENCE_POOL, 2 + (1 if post_rng.random() > 0.6 else 0), post_rng)
+            attributed_ids = _pick_unique(account_ids, total_attributed, rng)
+            community_ids = _community_ids_for_accounts(community_map, interval.interval_id, attributed_ids)
+            evidence_count = 2 + (1 if rng.random() > 0.6 else 0)
+            evidence = list(_pick_evidence(interval.interval_id, post_index, evidence_count))
 
-            created_at = interval.end_at - timedelta(hours=post_rng.randint(1, 6))
+            created_at = interval.end_at - timedelta(hours=rng.randint(1, 6))
 
-            posts.append({
+            posts.append((created_at, {
                 "id": f"mock_post_{interval.interval_id}_{post_index}",
                 "interval_id": interval.interval_id,
                 "created_at": created_at.isoformat(),
                 "text": snippet,
                 "metrics": {
-                    "likes": 40 + post_rng.randint(0, 420),
-                    "replies": 5 + post_rng.randint(0, 70),
-                    "reposts": 10 + post_rng.randint(0, 110),
-                    "quotes": 2 + post_rng.randint(0, 22),
+                    "likes": 40 + rng.randint(0, 420),
+                    "replies": 5 + rng.randint(0, 70),
+                    "reposts": 10 + rng.randint(0, 110),
+                    "quotes": 2 + rng.randint(0, 22),
                 },
                 "attribution": {
                     "high": high,
@@ -178,14 +232,14 @@ def generate_mock_posts(
                     "low": low,
                 },
                 "evidence": evidence,
-                "follower_delta": max(total_attributed, 1) + post_rng.randint(0, 6),
+                "follower_delta": max(total_attributed, 1) + rng.randint(0, 6),
                 "attributed_follower_ids": attributed_ids,
                 "community_ids": community_ids,
                 "is_mock": True,
                 "timeframe_days": timeframe_window,
-            })
+            }))
 
-    return sorted(posts, key=lambda post: post["created_at"])
+    return sorted(posts, key=lambda timed: timed[0])
 
 
 def seed_mock_post_attributions(
@@ -195,81 +249,79 @@ def seed_mock_post_attributions(
     rebuild: bool = False,
 ) -> list[dict]:
     _ensure_mock_accounts(db)
-    posts = generate_mock_posts(db, timeframe_window, limit)
+    # Keep each post's datetime alongside it rather than re-parsing the ISO string
+    timed_posts = _generate_timed_mock_posts(db, timeframe_window, limit)
+    posts = [post for _, post in timed_posts]
     if not posts:
         return []
 
-    author_id = "mock_author"
-    author = db.query(Account).filter(Account.account_id == author_id).first()
-    if not author:
-        author = Account(
-            account_id=author_id,
-            handle="mockdata",
-            name="Mock Author",
-            avatar_url=None,
-            bio="Synthetic author for mock attribution previews.",
-            followers_count=0,
-            following_count=0,
-            tweet_count=0,
-        )
-        db.add(author)
-        db.flush()
-
+    # One statement whether or not the author exists; nothing cached that a
+    # rollback or a deleted row could make stale
+    db.execute(dialect_insert(db, Account).on_conflict_do_nothing(), [{
+        "account_id": MOCK_AUTHOR_ID,
+        "handle": "mockdata",
+        "name": "Mock Author",
+        "avatar_url": None,
+        "bio": "Synthetic author for mock attribution previews.",
+        "followers_count": 0,
+        "following_count": 0,
+        "tweet_count": 0,
+    }])
+
+    post_ids = [post["id"] for post in posts]
     if rebuild:
+        # Rows for regenerated posts are overwritten by the upsert below; only
+        # mock attributions that are no longer generated need removing.
         db.query(PostAttribution).filter(
             PostAttribution.timeframe_window == timeframe_window,
             PostAttribution.post_id.like("mock_post_%"),
+            PostAttribution.post_id.not_in(post_ids),
         ).delete(synchronize_session=False)
 
-    for post in posts:
-        created_at = datetime.fromisoformat(post["created_at"])
-        metrics_json = json.dumps(post.get("metrics", {}))
-
-        existing_post = db.query(Post).filter(Post.post_id == post["id"]).first()
-        if existing_post:
-            existing_post.author_id = author.account_id
-            existing_post.created_at = created_at
-            existing_post.text = post.get("text", "")
-            existing_post.metrics_json = metrics_json
-            existing_post.last_seen_at = utc_now()
-        else:
-            db.add(Post(
-                post_id=post["id"],
-                author_id=author.account_id,
-                created_at=created_at,
-                text=post.get("text", ""),
-                metrics_json=metrics_json,
-                conversation_id=None,
-                in_reply_to_id=None,
-            ))
+    valid_interval_ids = {interval_id for (interval_id,) in db.query(Interval.interval_id)}
 
-        interval_id = post.get("interval_id")
-        interval_exists = False
-        if isinstance(interval_id, int):
-            interval_exists = db.query(Interval).filter(
-                Interval.interval_id == interval_id
-            ).first() is not None
-
-        existing_attr = db.query(PostAttribution).filter(
-            PostAttribution.post_id == post["id"],
-            PostAttribution.timeframe_window == timeframe_window,
-        ).first()
-
-        payload_json = json.dumps(post)
-        if existing_attr:
-            existing_attr.interval_id = interval_id if interval_exists else None
-            existing_attr.created_at = created_at
-            existing_attr.payload_json = payload_json
-            existing_attr.built_at = utc_now()
-        else:
-            db.add(PostAttribution(
-                post_id=post["id"],
-                interval_id=interval_id if interval_exists else None,
-                timeframe_window=timeframe_window,
-                created_at=created_at,
-                payload_json=payload_json,
-                built_at=utc_now(),
-            ))
+    post_rows: list[dict] = []
+    attr_rows: list[dict] = []
+    now = utc_now()
 
+    for created_at, post in timed_posts:
+        post_rows.append({
+            "post_id": post["id"],
+            "author_id": MOCK_AUTHOR_ID,
+            "created_at": created_at,
+            "text": post.get("text", ""),
+            "metrics_json": jsonutil.dumps(post.get("metrics", {})),
+            "conversation_id": None,
+            "in_reply_to_id": None,
+            "last_seen_at": now,
+        })
+
+        interval_id = post.get("interval_id")
+        interval_exists = isinstance(interval_id, int) and interval_id in valid_interval_ids
+        attr_rows.append({
+            "post_id": post["id"],
+            "interval_id": interval_id if interval_exists else None,
+            "timeframe_window": timeframe_window,
+            "created_at": created_at,
+            "payload_json": encode_payload(post),
+            "built_at": now,
+        })
+
+    # INSERT ... ON CONFLICT DO UPDATE replaces the existence probes and the
+    # separate insert/update passes. Batches bound statement size only: the
+    # seed commits once, so a failure leaves no partial seed behind.
+    for offset in range(0, len(post_rows), SEED_BATCH_SIZE):
+        upsert_rows(
+            db, Post, ["post_id"],
+            ("author_id", "created_at", "text", "metrics_json", "last_seen_at"),
+            post_rows[offset:offset + SEED_BATCH_SIZE],
+        )
+        upsert_rows(
+            db, PostAttribution, ["post_id", "timeframe_window"],
+            ("interval_id", "created_at", "payload_json", "built_at"),
+            attr_rows[offset:offset + SEED_BATCH_SIZE],
+        )
     db.commit()
+
+    invalidate_post_attribution_cache(db, timeframe_window)
     return posts
@@ -33,7 +33,7 @@ class RawFetch(Base):
     run_id: Mapped[int] = mapped_column(ForeignKey("runs.run_id"), index=True)
     fetched_at: Mapped[datetime] = mapped_column(DateTime, default=utc_now)
     endpoint: Mapped[str] = mapped_column(String(255))  # e.g., "users/followers"
-    params_hash: Mapped[str] = mapped_column(String(64))  # SHA256 of params
+    params_hash: Mapped[str] = mapped_column(String(64))  # Fingerprint of params
     cursor_in: Mapped[Optional[str]] = mapped_column(String(255), nullable=True)
     cursor_out: Mapped[Optional[str]] = mapped_column(String(255), nullable=True)
     truncated: Mapped[bool] = mapped_column(Boolean, default=False)
@@ -221,13 +221,15 @@ class Interval(Base):
     lost_followers_count: Mapped[int] = mapped_column(Integer, default=0)
     
     # Relationships
-    follow_events: Mapped[list["FollowEvent"]] = relationship(back_populates="interval")
-    interaction_events: Mapped[list["InteractionEvent"]] = relationship(back_populates="interval")
-    edges: Mapped[list["Edge"]] = relationship(back_populates="interval")
-    communities: Mapped[list["Community"]] = relationship(back_populates="interval")
-    positions: Mapped[list["Position"]] = relationship(back_populates="interval")
-    position_history: Mapped[list["PositionHistory"]] = relationship(back_populates="interval")
-    frames: Mapped[list["Frame"]] = relationship(back_populates="interval")
+    # Large per-interval collections raise instead of lazy loading, so code
+    # must query them in bulk rather than walking them interval by interval
+    follow_events: Mapped[list["FollowEvent"]] = relationship(back_populates="interval", lazy="raise_on_sql")
+    interaction_events: Mapped[list["InteractionEvent"]] = relationship(back_populates="interval", lazy="raise_on_sql")
+    edges: Mapped[list["Edge"]] = relationship(back_populates="interval", lazy="raise_on_sql")
+    communities: Mapped[list["Community"]] = relationship(back_populates="interval", lazy="raise_on_sql")
+    positions: Mapped[list["Position"]] = relationship(back_populates="interval", lazy="raise_on_sql")
+    position_history: Mapped[list["PositionHistory"]] = relationship(back_populates="interval", lazy="raise_on_sql")
+    frames: Mapped[list["Frame"]] = relationship(back_populates="interval", lazy="raise_on_sql")
 
 
 class Edge(Base):
@@ -307,7 +309,9 @@ class Frame(Base):
     id: Mapped[int] = mapped_column(primary_key=True)
     interval_id: Mapped[int] = mapped_column(ForeignKey("intervals.interval_id"), index=True)
     timeframe_window: Mapped[int] = mapped_column(Integer)  # 7, 30, 90, or 0 for all
-    frame_json: Mapped[str] = mapped_column(Text)  # Full frame data
+    # Frame summary plus per-node "nodeMeta"; nodes and edges live in the
+    # interval's positions/communities/edges rows and get_frame reassembles them
+    frame_json: Mapped[str] = mapped_column(Text)
     node_count: Mapped[int] = mapped_column(Integer)
     edge_count: Mapped[int] = mapped_column(Integer)
     build_meta_json: Mapped[Optional[str]] = mapped_column(Text, nullable=True)
@@ -372,6 +376,16 @@ class NetworkConnection(Base):
 Index("ix_raw_fetches_endpoint", RawFetch.endpoint)
 Index("ix_posts_created_at", Post.created_at)
 Index("ix_interaction_events_created", InteractionEvent.created_at)
+Index("ix_interaction_events_post_src", InteractionEvent.post_id, InteractionEvent.src_id)
+Index("ix_follow_events_interval_kind", FollowEvent.interval_id, FollowEvent.kind, FollowEvent.account_id)
 Index("ix_intervals_time", Interval.start_at, Interval.end_at)
+Index("ix_intervals_end_at", Interval.end_at)
 Index("ix_position_history_interval_account", PositionHistory.interval_id, PositionHistory.account_id, PositionHistory.recorded_at)
 Index("ix_post_attributions_timeframe_created", PostAttribution.timeframe_window, PostAttribution.created_at)
+# Index-only (post_id, timeframe_window) lookups on PostgreSQL. SQLite has no
+# INCLUDE and its unique index already carries the rowid primary key.
+Index(
+    "ix_post_attributions_post_timeframe_covering",
+    PostAttribution.post_id, PostAttribution.timeframe_window,
+    postgresql_include=["interval_id", "built_at"],
+).ddl_if(dialect="postgresql")
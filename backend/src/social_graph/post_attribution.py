@@ -1,13 +1,21 @@
 """Post attribution computation and persistence."""
 from __future__ import annotations
 
-import json
+import threading
+import time
+import weakref
 from datetime import datetime, timedelta
+from functools import lru_cache
+from sys import intern
 from typing import Iterable, Optional
 
+import numpy as np
+from sqlalchemy import bindparam, exists, func, select
+from sqlalchemy.engine import Engine, Row
 from sqlalchemy.orm import Session
 
 from .config import settings
+from .database import upsert_rows
 from .models import (
     Community,
     FollowEvent,
@@ -18,6 +26,75 @@ from .models import (
     PostEngager,
 )
 from .models import utc_now
+from . import jsonutil
+
+
+# Payload keys that copy PostAttribution columns; dropped on write, restored on read
+_COLUMN_PAYLOAD_KEYS = ("id", "timeframe_days")
+
+
+# Stored load_post_attributions rows per engine, keyed by
+# (timeframe_window, limit) -> (monotonic time stored, latest attributed
+# created_at, rows). The rows stay encoded and are decoded on every hit,
+# so callers get payloads of their own to modify.
+_attribution_cache: "weakref.WeakKeyDictionary[Engine, dict[tuple[int, int], tuple[float, Optional[datetime], list[Row]]]]" = (
+    weakref.WeakKeyDictionary()
+)
+_attribution_cache_lock = threading.Lock()
+
+# Statements built once and executed with bound values, so every call shares a
+# single compiled-cache entry (expanding IN params keep the key stable too)
+_LAST_END_BEFORE = select(func.max(Interval.end_at)).where(
+    Interval.end_at < bindparam("created_at")
+)
+_INTERVAL_TIMELINE = select(Interval.interval_id, Interval.start_at, Interval.end_at).where(
+    Interval.end_at >= bindparam("start_at")
+).order_by(Interval.end_at.asc())
+_NEWER_POST_EXISTS = select(exists().where(Post.created_at > bindparam("watermark")))
+# The id prefetches below can span many days of events; they stream in
+# batches (server-side cursors on PostgreSQL) instead of buffering every row
+STREAM_BATCH_SIZE = 5000
+
+_NEW_FOLLOWERS = select(FollowEvent.interval_id, FollowEvent.account_id).where(
+    FollowEvent.interval_id.in_(bindparam("interval_ids", expanding=True)),
+    FollowEvent.kind == "new",
+).execution_options(yield_per=STREAM_BATCH_SIZE)
+_POST_ENGAGERS = select(PostEngager.post_id, PostEngager.account_id).where(
+    PostEngager.post_id.in_(bindparam("post_ids", expanding=True))
+).execution_options(yield_per=STREAM_BATCH_SIZE)
+_POST_INTERACTIONS = select(InteractionEvent.post_id, InteractionEvent.src_id).where(
+    InteractionEvent.post_id.in_(bindparam("post_ids", expanding=True))
+).execution_options(yield_per=STREAM_BATCH_SIZE)
+_INTERVAL_COMMUNITIES = select(
+    Community.interval_id, Community.account_id, Community.community_id
+).where(
+    Community.interval_id.in_(bindparam("interval_ids", expanding=True))
+).execution_options(yield_per=STREAM_BATCH_SIZE)
+
+
+def encode_payload(payload: dict) -> str:
+    return jsonutil.dumps({
+        key: value for key, value in payload.items() if key not in _COLUMN_PAYLOAD_KEYS
+    })
+
+
+def decode_payload(row: PostAttribution | Row) -> Optional[dict]:
+    try:
+        stored = jsonutil.loads(row.payload_json)
+    except jsonutil.JSONDecodeError:
+        return None
+    payload = {"id": row.post_id}
+    payload.update(stored)
+    payload.setdefault("timeframe_days", row.timeframe_window)
+    return payload
+
+
+def invalidate_post_attribution_cache(db: Session, timeframe_window: int) -> None:
+    with _attribution_cache_lock:
+        entries = _attribution_cache.get(db.get_bind())
+        if entries:
+            for key in [key for key in entries if key[0] == timeframe_window]:
+                del entries[key]
 
 
 def _reference_time(db: Session) -> datetime:
@@ -28,135 +105,177 @@ def _reference_time(db: Session) -> datetime:
 
 
 def _parse_metrics(metrics_json: Optional[str]) -> dict:
+    likes, replies, reposts, quotes = _metric_counts(metrics_json)
+    return {"likes": likes, "replies": replies, "reposts": reposts, "quotes": quotes}
+
+
+# Many posts share identical metrics strings (zeroed counts especially)
+@lru_cache(maxsize=4096)
+def _metric_counts(metrics_json: Optional[str]) -> tuple[int, int, int, int]:
     if not metrics_json:
-        return {"likes": 0, "replies": 0, "reposts": 0, "quotes": 0}
+        return 0, 0, 0, 0
     try:
-        data = json.loads(metrics_json)
-    except json.JSONDecodeError:
-        return {"likes": 0, "replies": 0, "reposts": 0, "quotes": 0}
-
-    return {
-        "likes": int(data.get("like_count", data.get("likes", 0)) or 0),
-        "replies": int(data.get("reply_count", data.get("replies", 0)) or 0),
-        "reposts": int(data.get("retweet_count", data.get("reposts", 0)) or 0),
-        "quotes": int(data.get("quote_count", data.get("quotes", 0)) or 0),
-    }
+        data = jsonutil.loads(metrics_json)
+    except jsonutil.JSONDecodeError:
+        return 0, 0, 0, 0
+
+    return (
+        int(data.get("like_count", data.get("likes", 0)) or 0),
+        int(data.get("reply_count", data.get("replies", 0)) or 0),
+        int(data.get("retweet_count", data.get("reposts", 0)) or 0),
+        int(data.get("quote_count", data.get("quotes", 0)) or 0),
+    )
+
 
+def _load_interval_timeline(
+    db: Session,
+    earliest: datetime,
+) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """Interval ids, starts and ends (by end_at) from the last one ending before `earliest`."""
+    start_at = db.execute(_LAST_END_BEFORE, {"created_at": earliest}).scalar() or earliest
+    rows = db.execute(_INTERVAL_TIMELINE, {"start_at": start_at}).all()
+    ids = np.array([row[0] for row in rows], dtype=np.int64)
+    starts = np.array([row[1] for row in rows], dtype="datetime64[us]")
+    ends = np.array([row[2] for row in rows], dtype="datetime64[us]")
+    return ids, starts, ends
+
+
+def _resolve_post_intervals(
+    timeline: tuple[np.ndarray, np.ndarray, np.ndarray],
+    created_ats: list[datetime],
+) -> list[Optional[int]]:
+    """Containing interval per timestamp, else the one whose end is nearest."""
+    ids, starts, ends = timeline
+    if not len(ids):
+        return [None] * len(created_ats)
+
+    targets = np.array(created_ats, dtype="datetime64[us]")
+    # First interval ending at/after each post, and the one ending before it
+    after = np.searchsorted(ends, targets, side="left")
+    has_after = after < len(ends)
+    after = np.minimum(after, len(ends) - 1)
+    before = np.maximum(after - 1, 0)
+    has_before = np.where(has_after, after > 0, True)
+    before = np.where(has_after, before, len(ends) - 1)
+
+    contains = has_after & (starts[after] <= targets)
+    before_closer = (targets - ends[before]) < (ends[after] - targets)
+    pick_before = has_before & ~contains & (~has_after | before_closer)
+    return ids[np.where(pick_before, before, after)].tolist()
+
+
+def _window_interval_ids(
+    timeline: tuple[np.ndarray, np.ndarray, np.ndarray],
+    created_ats: list[datetime],
+    lookback_days: int,
+) -> list[list[int]]:
+    """Ids of intervals ending within `lookback_days` after each timestamp."""
+    ids, _, ends = timeline
+    targets = np.array(created_ats, dtype="datetime64[us]")
+    lo = np.searchsorted(ends, targets, side="left")
+    hi = np.searchsorted(ends, targets + np.timedelta64(lookback_days, "D"), side="right")
+    id_list = ids.tolist()
+    return [id_list[start:stop] for start, stop in zip(lo.tolist(), hi.tolist())]
+
+
+# Account ids from the prefetches below are interned: the same id recurs across
+# intervals and engager sets, and tiering membership checks then match on identity
+def _new_follower_ids_by_interval(
+    db: Session,
+    interval_ids: Iterable[int],
+) -> dict[int, set[str]]:
+    followers: dict[int, set[str]] = {}
+    rows = db.execute(_NEW_FOLLOWERS, {"interval_ids": list(interval_ids)})
+    for interval_id, account_id in rows:
+        followers.setdefault(interval_id, set()).add(intern(account_id))
+    return followers
 
-def _resolve_post_interval(db: Session, post: Post) -> Optional[Interval]:
-    interval = db.query(Interval).filter(
-        Interval.start_at <= post.created_at,
-        Interval.end_at >= post.created_at,
-    ).first()
-    if interval:
-        return interval
 
-    intervals = db.query(Interval).order_by(Interval.end_at.desc()).limit(200).all()
-    if not intervals:
-        return None
+def _engager_ids_by_post(db: Session, post_ids: list[str]) -> dict[str, set[str]]:
+    engagers: dict[str, set[str]] = {}
+    rows = db.execute(_POST_ENGAGERS, {"post_ids": post_ids})
+    for post_id, account_id in rows:
+        engagers.setdefault(post_id, set()).add(intern(account_id))
 
-    return min(intervals, key=lambda item: abs((item.end_at - post.created_at).total_seconds()))
+    rows = db.execute(_POST_INTERACTIONS, {"post_ids": post_ids})
+    for post_id, src_id in rows:
+        engagers.setdefault(post_id, set()).add(intern(src_id))
+    return engagers
 
 
-def _interval_ids_within_window(
+def _load_community_map(
     db: Session,
-    start_at: datetime,
-    lookback_days: int,
-) -> list[int]:
-    window_end = start_at + timedelta(days=lookback_days)
-    intervals = db.query(Interval).filter(
-        Interval.end_at >= start_at,
-        Interval.end_at <= window_end,
-    ).all()
-    return [interval.interval_id for interval in intervals]
+    interval_ids: Iterable[int],
+) -> dict[int, dict[str, set[int]]]:
+    community_map: dict[int, dict[str, set[int]]] = {}
+    rows = db.execute(_INTERVAL_COMMUNITIES, {"interval_ids": list(interval_ids)})
+    for interval_id, account_id, community_id in rows:
+        community_map.setdefault(interval_id, {}).setdefault(account_id, set()).add(community_id)
+    return community_map
 
 
 def _community_ids_for_accounts(
-    db: Session,
+    community_map: dict[int, dict[str, set[int]]],
     interval_id: Optional[int],
     account_ids: Iterable[str],
 ) -> list[int]:
-    account_ids = list(account_ids)
-    if not account_ids or interval_id is None:
+    interval_communities = community_map.get(interval_id)
+    if not interval_communities:
         return []
 
-    rows = db.query(Community).filter(
-        Community.interval_id == interval_id,
-        Community.account_id.in_(account_ids),
-    ).all()
-
-    return sorted({row.community_id for row in rows})
+    community_ids: set[int] = set()
+    for account_id in account_ids:
+        community_ids.update(interval_communities.get(account_id, ()))
+    return sorted(community_ids)
 
 
 def _compute_post_payload(
-    db: Session,
     post: Post,
+    post_interval_id: int,
+    interval_ids: list[int],
+    followers_by_interval: dict[int, set[str]],
+    engagers_by_post: dict[str, set[str]],
+    community_map: dict[int, dict[str, set[int]]],
     timeframe_window: int,
-) -> Optional[dict]:
-    post_interval = _resolve_post_interval(db, post)
-    if not post_interval:
-        return None
-    interval_ids = _interval_ids_within_window(
-        db,
-        post.created_at,
-        settings.attribution_lookback_days,
-    )
-
-    if post_interval.interval_id not in interval_ids:
-        interval_ids.append(post_interval.interval_id)
-
-    if not interval_ids:
-        return None
-
-    new_followers = db.query(FollowEvent).filter(
-        FollowEvent.interval_id.in_(interval_ids),
-        FollowEvent.kind == "new",
-    ).all()
-    new_follower_ids = {event.account_id for event in new_followers}
-
-    engagers = db.query(PostEngager).filter(PostEngager.post_id == post.post_id).all()
-    engager_ids = {engager.account_id for engager in engagers}
-
-    interactions = db.query(InteractionEvent).filter(
-        InteractionEvent.post_id == post.post_id
-    ).all()
-    for interaction in interactions:
-        engager_ids.add(interaction.src_id)
-
-    high_ids = new_follower_ids.intersection(engager_ids)
-
-    medium_ids: set[str] = set()
-    if post_interval:
-        same_interval = db.query(FollowEvent).filter(
-            FollowEvent.interval_id == post_interval.interval_id,
-            FollowEvent.kind == "new",
-        ).all()
-        medium_ids = {event.account_id for event in same_interval}
-        medium_ids -= high_ids
-
-    low_ids = new_follower_ids - high_ids - medium_ids
+) -> dict:
+    new_follower_ids: set[str] = set()
+    for interval_id in interval_ids:
+        new_follower_ids.update(followers_by_interval.get(interval_id, ()))
+
+    engager_ids = engagers_by_post.get(post.post_id, set())
+    same_interval_ids = followers_by_interval.get(post_interval_id, set())
+
+    # The post's own interval is part of the window, so every follower lands
+    # in exactly one tier: engaged, followed in the same interval, or neither
+    high_ids: list[str] = []
+    medium_ids: list[str] = []
+    low_ids: list[str] = []
+    for account_id in new_follower_ids:
+        if account_id in engager_ids:
+            high_ids.append(account_id)
+        elif account_id in same_interval_ids:
+            medium_ids.append(account_id)
+        else:
+            low_ids.append(account_id)
 
     evidence: list[str] = []
     if engager_ids:
         evidence.append("Direct engagement within attribution window")
-    if post_interval:
-        evidence.append("New followers in same interval as post")
+    evidence.append("New followers in same interval as post")
     if len(interval_ids) > 1:
         evidence.append("Followed within lookback window")
-    if not evidence:
-        evidence.append("Interval-based correlation")
 
     follower_delta = len(medium_ids)
-    attributed_ids = list(high_ids | medium_ids | low_ids)
+    attributed_ids = high_ids + medium_ids + low_ids
     community_ids = _community_ids_for_accounts(
-        db,
-        post_interval.interval_id,
+        community_map,
+        post_interval_id,
         attributed_ids,
     )
 
     payload = {
         "id": post.post_id,
-        "interval_id": post_interval.interval_id,
+        "interval_id": post_interval_id,
         "created_at": post.created_at.isoformat(),
         "text": post.text,
         "metrics": _parse_metrics(post.metrics_json),
@@ -176,23 +295,46 @@ def _compute_post_payload(
     return payload
 
 
-def load_post_attributions(
+def _load_attribution_entry(
     db: Session,
     timeframe_window: int,
     limit: int,
-) -> list[dict]:
-    rows = db.query(PostAttribution).filter(
-        PostAttribution.timeframe_window == timeframe_window
-    ).order_by(PostAttribution.created_at.desc()).limit(limit).all()
+) -> tuple[Optional[datetime], list[dict]]:
+    """(latest attributed created_at, payloads newest first), cached per engine."""
+    bind = db.get_bind()
+    key = (timeframe_window, limit)
+    with _attribution_cache_lock:
+        cached = _attribution_cache.get(bind, {}).get(key)
+    if cached and time.monotonic() - cached[0] < settings.attribution_cache_ttl_seconds:
+        watermark, rows = cached[1], cached[2]
+    else:
+        rows = db.query(
+            PostAttribution.post_id,
+            PostAttribution.timeframe_window,
+            PostAttribution.created_at,
+            PostAttribution.payload_json,
+        ).filter(
+            PostAttribution.timeframe_window == timeframe_window
+        ).order_by(PostAttribution.created_at.desc()).limit(limit).all()
+        # Rows are newest first, so the first one is the latest attributed post
+        watermark = rows[0].created_at if rows else None
+        with _attribution_cache_lock:
+            _attribution_cache.setdefault(bind, {})[key] = (time.monotonic(), watermark, rows)
 
     results = []
     for row in rows:
-        try:
-            results.append(json.loads(row.payload_json))
-        except json.JSONDecodeError:
-            continue
+        payload = decode_payload(row)
+        if payload is not None:
+            results.append(payload)
+    return watermark, results
 
-    return results
+
+def load_post_attributions(
+    db: Session,
+    timeframe_window: int,
+    limit: int,
+) -> list[dict]:
+    return _load_attribution_entry(db, timeframe_window, limit)[1]
 
 
 def build_post_attributions(
@@ -206,9 +348,19 @@ def build_post_attributions(
             PostAttribution.timeframe_window == timeframe_window
         ).delete()
         db.commit()
-
-    existing = load_post_attributions(db, timeframe_window, limit)
-    if existing and not rebuild:
+        invalidate_post_attribution_cache(db, timeframe_window)
+
+    # A rebuild has just cleared the window, so there is nothing to load
+    watermark, existing = None, []
+    if not rebuild:
+        watermark, existing = _load_attribution_entry(db, timeframe_window, limit)
+
+    # Incremental mode: with attributions already stored, only posts newer
+    # than the latest attributed one need computing. The watermark is cached
+    # with the payloads, so when nothing is newer one EXISTS probe is the
+    # only statement issued.
+    incremental = bool(existing)
+    if incremental and not db.execute(_NEWER_POST_EXISTS, {"watermark": watermark}).scalar():
         return existing
 
     reference_time = _reference_time(db)
@@ -218,38 +370,78 @@ def build_post_attributions(
             Post.created_at >= reference_time - timedelta(days=timeframe_window)
         )
 
+    if incremental:
+        posts_query = posts_query.filter(Post.created_at > watermark)
+
     posts = posts_query.order_by(Post.created_at.desc()).limit(limit).all()
     if not posts:
-        return []
+        return existing
 
-    results: list[dict] = []
-    for post in posts:
-        payload = _compute_post_payload(db, post, timeframe_window)
-        if not payload:
+    # Resolve every post's interval and lookback window from one interval
+    # timeline, then fetch everything the payloads need in a handful of IN
+    # queries instead of several queries per post
+    created_ats = [post.created_at for post in posts]
+    timeline = _load_interval_timeline(db, min(created_ats))
+    windows = _window_interval_ids(timeline, created_ats, settings.attribution_lookback_days)
+    resolved: list[tuple[Post, int, list[int]]] = []
+    for post, post_interval_id, interval_ids in zip(
+        posts, _resolve_post_intervals(timeline, created_ats), windows
+    ):
+        if post_interval_id is None:
             continue
+        if post_interval_id not in interval_ids:
+            interval_ids.append(post_interval_id)
+        resolved.append((post, post_interval_id, interval_ids))
 
-        existing_row = db.query(PostAttribution).filter(
-            PostAttribution.post_id == post.post_id,
-            PostAttribution.timeframe_window == timeframe_window,
-        ).first()
+    if not resolved:
+        return existing
 
-        if existing_row:
-            existing_row.interval_id = payload.get("interval_id")
-            existing_row.created_at = post.created_at
-            existing_row.payload_json = json.dumps(payload)
-            existing_row.built_at = utc_now()
-        else:
-            db.add(PostAttribution(
-                post_id=post.post_id,
-                interval_id=payload.get("interval_id"),
-                timeframe_window=timeframe_window,
-                created_at=post.created_at,
-                payload_json=json.dumps(payload),
-                built_at=utc_now(),
-            ))
+    post_ids = [post.post_id for post, _, _ in resolved]
+    followers_by_interval = _new_follower_ids_by_interval(
+        db,
+        {interval_id for _, _, interval_ids in resolved for interval_id in interval_ids},
+    )
+    engagers_by_post = _engager_ids_by_post(db, post_ids)
+    community_map = _load_community_map(
+        db,
+        {post_interval_id for _, post_interval_id, _ in resolved},
+    )
 
+    results: list[dict] = []
+    rows: list[dict] = []
+    built_at = utc_now()
+    for post, post_interval_id, interval_ids in resolved:
+        payload = _compute_post_payload(
+            post,
+            post_interval_id,
+            interval_ids,
+            followers_by_interval,
+            engagers_by_post,
+            community_map,
+            timeframe_window,
+        )
+        rows.append({
+            "post_id": post.post_id,
+            "interval_id": post_interval_id,
+            "timeframe_window": timeframe_window,
+            "created_at": post.created_at,
+            "payload_json": encode_payload(payload),
+            "built_at": built_at,
+        })
         results.append(payload)
 
+    # One INSERT ... ON CONFLICT DO UPDATE replaces the per-row update/insert
+    upsert_rows(
+        db,
+        PostAttribution,
+        ["post_id", "timeframe_window"],
+        ("interval_id", "created_at", "payload_json", "built_at"),
+        rows,
+    )
     db.commit()
-    results.sort(key=lambda item: item["created_at"], reverse=True)
-    return results[:limit]
+    invalidate_post_attribution_cache(db, timeframe_window)
+    if incremental:
+        return load_post_attributions(db, timeframe_window, limit)
+    # Posts were fetched newest first with the limit applied, so results
+    # are already in order
+    return results
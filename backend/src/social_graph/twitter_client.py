@@ -1,11 +1,132 @@
 """TwitterAPI.io client for data collection."""
+import asyncio
 import hashlib
-import json
+import importlib.util
+import math
+import sqlite3
+import threading
+import time
+import weakref
+from collections import OrderedDict
 from datetime import datetime
-from typing import Optional, AsyncGenerator, Any
+from typing import Optional, AsyncGenerator, Any, Awaitable, Callable, NoReturn
 import httpx
 
 from .config import settings
+from . import jsonutil
+
+
+# HTTP/2 multiplexing needs the optional h2 package (httpx[http2])
+HTTP2_AVAILABLE = importlib.util.find_spec("h2") is not None
+# Sized for the concurrent paths (bulk user lookups, multi-user pagination)
+# rather than for raw throughput; the API rate limit binds first
+HTTP_LIMITS = httpx.Limits(max_connections=64, max_keepalive_connections=32, keepalive_expiry=30.0)
+HTTP_TIMEOUT = httpx.Timeout(60.0, connect=5.0)
+# Connection failures are retried by the transport; HTTP errors still surface
+HTTP_CONNECT_RETRIES = 2
+
+# Profile lookups repeat across a crawl (the ego account, hub accounts)
+USER_CACHE_SIZE = 10_000
+USER_CACHE_TTL_SECONDS = 3600.0
+
+
+def _new_pool() -> httpx.AsyncHTTPTransport:
+    """Pooled transport with the shared limits and connect retries."""
+    return httpx.AsyncHTTPTransport(
+        limits=HTTP_LIMITS,
+        http2=HTTP2_AVAILABLE,
+        retries=HTTP_CONNECT_RETRIES
+    )
+
+
+class _SharedTransport(httpx.AsyncBaseTransport):
+    """Per-client view of a shared pool; closing a client leaves the pool open."""
+
+    def __init__(self, pool: httpx.AsyncHTTPTransport):
+        self._pool = pool
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        return await self._pool.handle_async_request(request)
+
+    async def aclose(self) -> None:
+        pass
+
+
+# Pooled connections belong to the event loop that opened them, so clients
+# share one pool per loop (the API server creates a client per request)
+_shared_pools: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, httpx.AsyncHTTPTransport]" = (
+    weakref.WeakKeyDictionary()
+)
+
+
+def _http_transport() -> httpx.AsyncBaseTransport:
+    """Transport over the running loop's shared pool, or a private pool outside a loop."""
+    try:
+        loop = asyncio.get_running_loop()
+    except RuntimeError:
+        return _new_pool()
+    pool = _shared_pools.get(loop)
+    if pool is None:
+        pool = _shared_pools[loop] = _new_pool()
+    return _SharedTransport(pool)
+
+
+def params_hash(params: dict) -> str:
+    """Fingerprint request parameters as 16 hex chars (a cache key, not a signature)."""
+    return hashlib.blake2b(jsonutil.dumpb(params, sort_keys=True), digest_size=8).hexdigest()
+
+
+class ResponseCache:
+    """
+    SQLite file of raw 200 response bodies, each expiring after ttl_seconds.
+    Calls block on disk I/O, so clients run them in a worker thread; a lock
+    serializes them on the one connection.
+    """
+
+    def __init__(self, path: str, ttl_seconds: float):
+        self.ttl_seconds = ttl_seconds
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS responses "
+            "(key TEXT PRIMARY KEY, stored_at REAL NOT NULL, body BLOB NOT NULL)"
+        )
+        self._conn.commit()
+
+    def get(self, key: str) -> Optional[bytes]:
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT stored_at, body FROM responses WHERE key = ?", (key,)
+            ).fetchone()
+        if row is None or time.time() - row[0] > self.ttl_seconds:
+            return None
+        return row[1]
+
+    def set(self, key: str, body: bytes):
+        with self._lock, self._conn:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO responses (key, stored_at, body) VALUES (?, ?, ?)",
+                (key, time.time(), body)
+            )
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
+
+
+# One cache (and SQLite connection) per file, shared by every client for the
+# life of the process; the API builds a client per request
+_response_caches: dict[str, ResponseCache] = {}
+_response_caches_lock = threading.Lock()
+
+
+def _response_cache(path: str, ttl_seconds: float) -> ResponseCache:
+    """The shared cache for `path`, opened on first use."""
+    with _response_caches_lock:
+        cache = _response_caches.get(path)
+        if cache is None:
+            cache = _response_caches[path] = ResponseCache(path, ttl_seconds)
+        return cache
 
 
 class TwitterAPIError(Exception):
@@ -17,18 +138,30 @@ class TwitterAPIError(Exception):
         super().__init__(f"Twitter API {status_code}: {message}")
 
 
+def _raise_for_status(response: httpx.Response, rate_limit_message: str) -> NoReturn:
+    """Raise TwitterAPIError for a non-200 response, keeping its body when it is JSON."""
+    try:
+        error_data = jsonutil.loads(response.content)
+    except ValueError:  # JSONDecodeError or undecodable bytes
+        error_data = {"error": response.text}
+    if response.status_code == 429:
+        raise TwitterAPIError(429, rate_limit_message, error_data)
+    raise TwitterAPIError(response.status_code, str(error_data), error_data)
+
+
 class TwitterClient:
     """TwitterAPI.io client with pagination support."""
 
     BASE_URL = "https://api.twitterapi.io"
     X_BASE_URL = "https://api.twitter.com/2"
 
-    def __init__(self, api_key: str = None):
+    def __init__(self, api_key: str = None, cache_enabled: Optional[bool] = None):
         self.api_key = api_key or settings.twitter_bearer_token
         self.client = httpx.AsyncClient(
             base_url=self.BASE_URL,
             headers={"x-api-key": self.api_key},
-            timeout=60.0
+            timeout=HTTP_TIMEOUT,
+            transport=_http_transport()
         )
         self.x_bearer_token = settings.x_bearer_token or ""
         self.x_client = None
@@ -36,15 +169,32 @@ class TwitterClient:
             self.x_client = httpx.AsyncClient(
                 base_url=self.X_BASE_URL,
                 headers={"Authorization": f"Bearer {self.x_bearer_token}"},
-                timeout=60.0
+                timeout=HTTP_TIMEOUT,
+                transport=_http_transport()
             )
+        # Off by default: cached follower pages would hide real follower changes
+        if cache_enabled is None:
+            cache_enabled = settings.api_cache_enabled
+        self.cache = None
+        if cache_enabled:
+            self.cache = _response_cache(settings.api_cache_path, settings.api_cache_ttl_seconds)
+        # lowercased username -> (fetched at, user); usernames are case-insensitive
+        self._user_cache: "OrderedDict[str, tuple[float, dict]]" = OrderedDict()
+        self._user_lookups: dict[str, asyncio.Task] = {}
 
     async def close(self):
-        """Close the HTTP client."""
+        """Close the HTTP client. The response cache is shared and stays open."""
         await self.client.aclose()
         if self.x_client:
             await self.x_client.aclose()
 
+    @classmethod
+    async def shutdown(cls):
+        """Close the connection pool shared by clients on the running event loop."""
+        pool = _shared_pools.pop(asyncio.get_running_loop(), None)
+        if pool is not None:
+            await pool.aclose()
+
     async def __aenter__(self):
         return self
 
@@ -53,8 +203,7 @@ class TwitterClient:
 
     def _params_hash(self, params: dict) -> str:
         """Generate hash of request parameters."""
-        sorted_params = json.dumps(params, sort_keys=True)
-        return hashlib.sha256(sorted_params.encode()).hexdigest()[:16]
+        return params_hash(params)
 
     def _extract_list(self, payload: dict, key: str) -> list:
         """Extract list payloads from twitterapi.io responses."""
@@ -82,19 +231,7 @@ class TwitterClient:
         params: dict = None
     ) -> dict:
         """Make API request, return response data."""
-        response = await self.client.request(method, endpoint, params=params)
-
-        if response.status_code == 429:
-            raise TwitterAPIError(429, "Rate limited", response.json())
-
-        if response.status_code != 200:
-            try:
-                error_data = response.json()
-            except:
-                error_data = {"error": response.text}
-            raise TwitterAPIError(response.status_code, str(error_data), error_data)
-
-        return response.json()
+        return await self._send(self.client, "", "Rate limited", method, endpoint, params)
 
     async def _x_request(
         self,
@@ -105,26 +242,75 @@ class TwitterClient:
         """Make X API request, return response data."""
         if not self.x_client:
             raise TwitterAPIError(401, "X API bearer token not configured")
+        return await self._send(self.x_client, "x:", "X API rate limited", method, endpoint, params)
 
-        response = await self.x_client.request(method, endpoint, params=params)
-
-        if response.status_code == 429:
-            raise TwitterAPIError(429, "X API rate limited", response.json())
-
+    async def _send(
+        self,
+        client: httpx.AsyncClient,
+        cache_prefix: str,
+        rate_limit_message: str,
+        method: str,
+        endpoint: str,
+        params: Optional[dict]
+    ) -> dict:
+        """Request through `client`, with the response cache and error handling both APIs share."""
+        cache_key = None
+        if self.cache:
+            cache_key = f"{cache_prefix}{method} {endpoint}:{params_hash(params or {})}"
+            cached = await asyncio.to_thread(self.cache.get, cache_key)
+            if cached is not None:
+                return jsonutil.loads(cached)
+
+        response = await client.request(method, endpoint, params=params)
         if response.status_code != 200:
-            try:
-                error_data = response.json()
-            except Exception:
-                error_data = {"error": response.text}
-            raise TwitterAPIError(response.status_code, str(error_data), error_data)
+            _raise_for_status(response, rate_limit_message)
 
-        return response.json()
+        if cache_key:
+            await asyncio.to_thread(self.cache.set, cache_key, response.content)
+        return jsonutil.loads(response.content)
 
     def has_x_api(self) -> bool:
         return self.x_client is not None
 
     async def get_user_by_username(self, username: str) -> dict:
-        """Get user by username."""
+        """
+        Get user by username. Results are kept for an hour, and concurrent
+        lookups of the same username share one request. Every caller gets
+        its own copy of the user.
+        """
+        key = username.lower()
+        cached = self._user_cache.get(key)
+        if cached is not None and time.monotonic() - cached[0] < USER_CACHE_TTL_SECONDS:
+            self._user_cache.move_to_end(key)
+            return self._copy_user(cached[1])
+
+        lookup = self._user_lookups.get(key)
+        if lookup is None:
+            lookup = self._user_lookups[key] = asyncio.create_task(self._fetch_user(username))
+
+            def lookup_done(task: asyncio.Task) -> None:
+                self._user_lookups.pop(key, None)
+                # Retrieve a failure even if every waiter was cancelled, so
+                # asyncio doesn't report it as never retrieved
+                if not task.cancelled():
+                    task.exception()
+
+            lookup.add_done_callback(lookup_done)
+        # Shielded so one caller's cancellation doesn't fail the others
+        user = await asyncio.shield(lookup)
+
+        self._user_cache[key] = (time.monotonic(), user)
+        self._user_cache.move_to_end(key)
+        while len(self._user_cache) > USER_CACHE_SIZE:
+            self._user_cache.popitem(last=False)
+        return self._copy_user(user)
+
+    @staticmethod
+    def _copy_user(user: dict) -> dict:
+        # public_metrics is the only nested value
+        return {**user, "public_metrics": dict(user["public_metrics"])}
+
+    async def _fetch_user(self, username: str) -> dict:
         data = await self._request("GET", "/twitter/user/info", params={"userName": username})
         user_data = data.get("data", {})
         # Normalize to standard format
@@ -141,89 +327,156 @@ class TwitterClient:
             "created_at": user_data.get("createdAt"),
         }
 
-    async def paginate_followers(
+    def paginate_followers(
         self,
         user_id: str,
         max_results: int = 200,
         max_pages: int = None,
-        username: str = None
+        username: str = None,
+        prefetch: bool = False
     ) -> AsyncGenerator[tuple[list[dict], str, str, bool], None]:
         """
         Paginate through followers.
         Yields: (users, cursor_in, cursor_out, truncated)
         """
-        cursor = None
-        page_count = 0
-
-        while True:
-            params = {
-                "userName": username,
-                "pageSize": min(max_results, 200)
-            }
-            if cursor:
-                params["cursor"] = cursor
-
-            cursor_in = cursor
-            data = await self._request("GET", "/twitter/user/followers", params)
-
-            # Normalize user data from twitterapi.io format
-            raw_users = self._extract_list(data, "followers")
-            users = [self._normalize_user(u) for u in raw_users]
-
-            cursor_out = data.get("next_cursor")
-
-            page_count += 1
-            truncated = max_pages and page_count >= max_pages and cursor_out is not None
-
-            yield (users, cursor_in, cursor_out, truncated)
-
-            # Stop if: no more cursor, hit max pages, or empty page (all data retrieved)
-            if not cursor_out or (max_pages and page_count >= max_pages) or len(users) == 0:
-                break
-
-            cursor = cursor_out
+        return self._paginate_user_list(
+            "/twitter/user/followers", "followers", username, max_results, max_pages, prefetch
+        )
 
-    async def paginate_following(
+    def paginate_following(
         self,
         user_id: str,
         max_results: int = 200,
         max_pages: int = None,
-        username: str = None
+        username: str = None,
+        prefetch: bool = False
     ) -> AsyncGenerator[tuple[list[dict], str, str, bool], None]:
         """
         Paginate through following.
         Yields: (users, cursor_in, cursor_out, truncated)
         """
-        cursor = None
-        page_count = 0
-
-        while True:
-            params = {
-                "userName": username,
-                "pageSize": min(max_results, 200)
-            }
-            if cursor:
-                params["cursor"] = cursor
+        return self._paginate_user_list(
+            "/twitter/user/followings", "followings", username, max_results, max_pages, prefetch
+        )
 
-            cursor_in = cursor
-            data = await self._request("GET", "/twitter/user/followings", params)
+    def _paginate_user_list(
+        self,
+        endpoint: str,
+        key: str,
+        username: Optional[str],
+        max_results: int,
+        max_pages: Optional[int],
+        prefetch: bool
+    ) -> AsyncGenerator[tuple[list[dict], str, str, bool], None]:
+        """Follower and following pages; these endpoints start from a None cursor."""
+        page_params = self._cursor_params({
+            "userName": username,
+            "pageSize": min(max_results, 200)
+        })
 
+        def parse_page(data: dict) -> tuple[list[dict], Optional[str]]:
             # Normalize user data from twitterapi.io format
-            raw_users = self._extract_list(data, "followings")
-            users = [self._normalize_user(u) for u in raw_users]
-
-            cursor_out = data.get("next_cursor")
+            users = [self._normalize_user(u) for u in self._extract_list(data, key)]
+            return users, data.get("next_cursor")
 
-            page_count += 1
-            truncated = max_pages and page_count >= max_pages and cursor_out is not None
+        return self._paginate(
+            self._request, endpoint, page_params, parse_page, max_pages, prefetch, first_cursor=None
+        )
 
-            yield (users, cursor_in, cursor_out, truncated)
+    async def _paginate(
+        self,
+        request: Callable[..., Awaitable[dict]],
+        endpoint: str,
+        page_params: Callable[[Optional[str]], dict],
+        parse_page: Callable[[dict], tuple[list[dict], Optional[str]]],
+        max_pages: Optional[int],
+        prefetch: bool,
+        first_cursor: Optional[str] = ""
+    ) -> AsyncGenerator[tuple[list[dict], str, str, bool], None]:
+        """
+        Cursor loop shared by every paginate_* method.
+        With prefetch, the next page is requested before the current one is
+        yielded. The request only progresses while the caller awaits, so it
+        overlaps a caller that does async I/O per page; a caller doing
+        synchronous work (the collector's database writes) gains nothing
+        and may waste a page when it stops early. Hence off by default.
+        """
+        cursor = first_cursor
+        page_count = 0
+        page_budget = max_pages or math.inf
+        pending: Optional[asyncio.Task] = None
+
+        try:
+            while True:
+                cursor_in = cursor
+                if pending is not None:
+                    data = await pending
+                    pending = None
+                else:
+                    data = await request("GET", endpoint, page_params(cursor))
+
+                items, cursor_out = parse_page(data)
+                # Release the decoded raw page before the caller works on
+                # (and the prefetch decodes) the next one
+                del data
+
+                page_count += 1
+                at_page_limit = page_count >= page_budget
+                truncated = at_page_limit and bool(cursor_out)
+
+                # Stop if: no more cursor, hit max pages, or empty page (all data retrieved)
+                done = not cursor_out or at_page_limit or not items
+                if prefetch and not done:
+                    pending = asyncio.create_task(
+                        request("GET", endpoint, page_params(cursor_out))
+                    )
+
+                yield (items, cursor_in, cursor_out, truncated)
+
+                if done:
+                    break
+
+                cursor = cursor_out
+        finally:
+            # The caller stopped early; drop the page it will never read
+            if pending is not None:
+                pending.cancel()
+
+    async def get_followers_bulk(
+        self,
+        usernames: list[str],
+        max_pages: int = None,
+        concurrency: int = 8
+    ) -> dict[str, list[dict]]:
+        """Fetch followers for several users, up to `concurrency` at a time."""
+        return await self._collect_user_lists(self.paginate_followers, usernames, max_pages, concurrency)
 
-            # Stop if: no more cursor, hit max pages, or empty page (all data retrieved)
-            if not cursor_out or (max_pages and page_count >= max_pages) or len(users) == 0:
-                break
+    async def get_following_bulk(
+        self,
+        usernames: list[str],
+        max_pages: int = None,
+        concurrency: int = 8
+    ) -> dict[str, list[dict]]:
+        """Fetch following for several users, up to `concurrency` at a time."""
+        return await self._collect_user_lists(self.paginate_following, usernames, max_pages, concurrency)
 
-            cursor = cursor_out
+    async def _collect_user_lists(
+        self,
+        paginate,
+        usernames: list[str],
+        max_pages: Optional[int],
+        concurrency: int
+    ) -> dict[str, list[dict]]:
+        semaphore = asyncio.Semaphore(concurrency)
+
+        async def collect(username: str) -> tuple[str, list[dict]]:
+            users: list[dict] = []
+            async with semaphore:
+                async for page, _, _, _ in paginate(None, max_pages=max_pages, username=username):
+                    users.extend(page)
+            return username, users
+
+        return dict(await asyncio.gather(*(collect(username) for username in usernames)))
 
     def _normalize_user(self, user: dict) -> dict:
         """Normalize twitterapi.io user format to standard format with all available fields."""
@@ -251,7 +504,8 @@ class TwitterClient:
     def _normalize_tweet(self, tweet: dict) -> dict:
         """Normalize tweet payload into a consistent format."""
         author = tweet.get("author") or {}
-        normalized_author = self._normalize_user(author) if author else None
+        # Consumers skip authors without an id, so don't build one for them
+        normalized_author = self._normalize_user(author) if author.get("id") else None
         return {
             "id": tweet.get("id"),
             "text": tweet.get("text"),
@@ -299,234 +553,159 @@ class TwitterClient:
         tweets = self._extract_list(data, "tweets")
         return [self._normalize_tweet(t) for t in tweets]
 
-    async def paginate_user_last_tweets(
+    def paginate_user_last_tweets(
         self,
         user_id: str = None,
         username: str = None,
         include_replies: bool = False,
-        max_pages: int = None
+        max_pages: int = None,
+        prefetch: bool = False
     ) -> AsyncGenerator[tuple[list[dict], str, str, bool], None]:
         """
         Paginate through a user's latest tweets.
         Yields: (tweets, cursor_in, cursor_out, truncated)
         """
-        cursor = ""
-        page_count = 0
-
-        while True:
-            params: dict[str, Any] = {}
-            if username:
-                params["userName"] = username
-            if user_id:
-                params["userId"] = user_id
-            if include_replies:
-                params["includeReplies"] = "true"
-            if cursor:
-                params["cursor"] = cursor
-
-            cursor_in = cursor
-            data = await self._request("GET", "/twitter/user/last_tweets", params)
-            raw_tweets = self._extract_list(data, "tweets")
-            tweets = [self._normalize_tweet(t) for t in raw_tweets]
-
-            cursor_out = data.get("next_cursor") or ""
-
-            page_count += 1
-            truncated = max_pages and page_count >= max_pages and cursor_out
-
-            yield (tweets, cursor_in, cursor_out, truncated)
-
-            if not cursor_out or (max_pages and page_count >= max_pages) or len(tweets) == 0:
-                break
+        page_params = self._cursor_params({
+            "userName": username,
+            "userId": user_id,
+            "includeReplies": "true" if include_replies else None,
+        })
 
-            cursor = cursor_out
+        return self._paginate(
+            self._request, "/twitter/user/last_tweets", page_params,
+            self._tweet_page("tweets"), max_pages, prefetch
+        )
 
-    async def paginate_tweet_replies(
+    def paginate_tweet_replies(
         self,
         tweet_id: str,
         since_time: int = None,
         until_time: int = None,
-        max_pages: int = None
+        max_pages: int = None,
+        prefetch: bool = False
     ) -> AsyncGenerator[tuple[list[dict], str, str, bool], None]:
         """Paginate replies for a tweet."""
-        cursor = ""
-        page_count = 0
-
-        while True:
-            params: dict[str, Any] = {
-                "tweetId": tweet_id,
-            }
-            if since_time:
-                params["sinceTime"] = since_time
-            if until_time:
-                params["untilTime"] = until_time
-            if cursor:
-                params["cursor"] = cursor
-
-            cursor_in = cursor
-            data = await self._request("GET", "/twitter/tweet/replies", params)
-            raw_tweets = self._extract_list(data, "replies") or self._extract_list(data, "tweets")
-            tweets = [self._normalize_tweet(t) for t in raw_tweets]
-            cursor_out = data.get("next_cursor") or ""
-
-            page_count += 1
-            truncated = max_pages and page_count >= max_pages and cursor_out
-
-            yield (tweets, cursor_in, cursor_out, truncated)
-
-            if not cursor_out or (max_pages and page_count >= max_pages) or len(tweets) == 0:
-                break
-
-            cursor = cursor_out
+        page_params = self._cursor_params({
+            "tweetId": tweet_id,
+            "sinceTime": since_time,
+            "untilTime": until_time,
+        })
+
+        return self._paginate(
+            self._request, "/twitter/tweet/replies", page_params,
+            self._tweet_page("replies", "tweets"), max_pages, prefetch
+        )
 
-    async def paginate_tweet_quotes(
+    def paginate_tweet_quotes(
         self,
         tweet_id: str,
         since_time: int = None,
         until_time: int = None,
         include_replies: bool = True,
-        max_pages: int = None
+        max_pages: int = None,
+        prefetch: bool = False
     ) -> AsyncGenerator[tuple[list[dict], str, str, bool], None]:
         """Paginate quote tweets for a tweet."""
-        cursor = ""
-        page_count = 0
-
-        while True:
-            params: dict[str, Any] = {
-                "tweetId": tweet_id,
-                "includeReplies": "true" if include_replies else "false",
-            }
-            if since_time:
-                params["sinceTime"] = since_time
-            if until_time:
-                params["untilTime"] = until_time
-            if cursor:
-                params["cursor"] = cursor
-
-            cursor_in = cursor
-            data = await self._request("GET", "/twitter/tweet/quotes", params)
-            raw_tweets = self._extract_list(data, "tweets")
-            tweets = [self._normalize_tweet(t) for t in raw_tweets]
-            cursor_out = data.get("next_cursor") or ""
-
-            page_count += 1
-            truncated = max_pages and page_count >= max_pages and cursor_out
-
-            yield (tweets, cursor_in, cursor_out, truncated)
-
-            if not cursor_out or (max_pages and page_count >= max_pages) or len(tweets) == 0:
-                break
-
-            cursor = cursor_out
+        page_params = self._cursor_params({
+            "tweetId": tweet_id,
+            "includeReplies": "true" if include_replies else "false",
+            "sinceTime": since_time,
+            "untilTime": until_time,
+        })
+
+        return self._paginate(
+            self._request, "/twitter/tweet/quotes", page_params,
+            self._tweet_page("tweets"), max_pages, prefetch
+        )
 
-    async def paginate_tweet_retweeters(
+    def paginate_tweet_retweeters(
         self,
         tweet_id: str,
-        max_pages: int = None
+        max_pages: int = None,
+        prefetch: bool = False
     ) -> AsyncGenerator[tuple[list[dict], str, str, bool], None]:
         """Paginate retweeters for a tweet."""
-        cursor = ""
-        page_count = 0
+        page_params = self._cursor_params({"tweetId": tweet_id})
 
-        while True:
-            params: dict[str, Any] = {
-                "tweetId": tweet_id,
-            }
-            if cursor:
-                params["cursor"] = cursor
-
-            cursor_in = cursor
-            data = await self._request("GET", "/twitter/tweet/retweeters", params)
-            raw_users = self._extract_list(data, "users")
-            users = [self._normalize_user(u) for u in raw_users]
-            cursor_out = data.get("next_cursor") or ""
-
-            page_count += 1
-            truncated = max_pages and page_count >= max_pages and cursor_out
-
-            yield (users, cursor_in, cursor_out, truncated)
+        def parse_page(data: dict) -> tuple[list[dict], str]:
+            users = [self._normalize_user(u) for u in self._extract_list(data, "users")]
+            return users, data.get("next_cursor") or ""
 
-            if not cursor_out or (max_pages and page_count >= max_pages) or len(users) == 0:
-                break
-
-            cursor = cursor_out
+        return self._paginate(
+            self._request, "/twitter/tweet/retweeters", page_params, parse_page, max_pages, prefetch
+        )
 
-    async def paginate_user_mentions(
+    def paginate_user_mentions(
         self,
         username: str,
         since_time: int = None,
         until_time: int = None,
-        max_pages: int = None
+        max_pages: int = None,
+        prefetch: bool = False
     ) -> AsyncGenerator[tuple[list[dict], str, str, bool], None]:
         """Paginate tweets mentioning a user."""
-        cursor = ""
-        page_count = 0
-
-        while True:
-            params: dict[str, Any] = {
-                "userName": username,
-            }
-            if since_time:
-                params["sinceTime"] = since_time
-            if until_time:
-                params["untilTime"] = until_time
-            if cursor:
-                params["cursor"] = cursor
-
-            cursor_in = cursor
-            data = await self._request("GET", "/twitter/user/mentions", params)
-            raw_tweets = self._extract_list(data, "tweets")
-            tweets = [self._normalize_tweet(t) for t in raw_tweets]
-            cursor_out = data.get("next_cursor") or ""
-
-            page_count += 1
-            truncated = max_pages and page_count >= max_pages and cursor_out
-
-            yield (tweets, cursor_in, cursor_out, truncated)
-
-            if not cursor_out or (max_pages and page_count >= max_pages) or len(tweets) == 0:
-                break
+        page_params = self._cursor_params({
+            "userName": username,
+            "sinceTime": since_time,
+            "untilTime": until_time,
+        })
 
-            cursor = cursor_out
+        return self._paginate(
+            self._request, "/twitter/user/mentions", page_params,
+            self._tweet_page("tweets"), max_pages, prefetch
+        )
 
     async def paginate_tweet_liking_users(
         self,
         tweet_id: str,
         max_pages: int = None,
-        max_results: int = 100
+        max_results: int = 100,
+        prefetch: bool = False
     ) -> AsyncGenerator[tuple[list[dict], str, str, bool], None]:
         """Paginate users who liked a tweet (X API v2)."""
         if not self.x_client:
             return
 
-        cursor = ""
-        page_count = 0
-        user_fields = "id,name,username,profile_image_url,public_metrics,created_at,description,location"
-
-        while True:
-            params: dict[str, Any] = {
-                "max_results": min(max_results, 100),
-                "user.fields": user_fields,
-            }
-            if cursor:
-                params["pagination_token"] = cursor
+        page_params = self._cursor_params({
+            "max_results": min(max_results, 100),
+            "user.fields": "id,name,username,profile_image_url,public_metrics,created_at,description,location",
+        }, cursor_key="pagination_token")
 
-            cursor_in = cursor
-            data = await self._x_request("GET", f"/tweets/{tweet_id}/liking_users", params)
+        def parse_page(data: dict) -> tuple[list[dict], str]:
             raw_users = data.get("data", []) or []
-            users = [self._normalize_x_user(u) for u in raw_users]
             meta = data.get("meta") or {}
-            cursor_out = meta.get("next_token") or ""
-
-            page_count += 1
-            truncated = max_pages and page_count >= max_pages and cursor_out
-
-            yield (users, cursor_in, cursor_out, truncated)
-
-            if not cursor_out or (max_pages and page_count >= max_pages) or len(users) == 0:
-                break
+            return [self._normalize_x_user(u) for u in raw_users], meta.get("next_token") or ""
+
+        async for page in self._paginate(
+            self._x_request, f"/tweets/{tweet_id}/liking_users", page_params, parse_page, max_pages, prefetch
+        ):
+            yield page
+
+    @staticmethod
+    def _cursor_params(
+        fixed: dict[str, Any],
+        cursor_key: str = "cursor"
+    ) -> Callable[[Optional[str]], dict]:
+        """Page params builder: the set entries of `fixed`, plus the cursor when there is one."""
+        base = {key: value for key, value in fixed.items() if value}
+
+        def page_params(cursor: Optional[str]) -> dict:
+            if cursor:
+                return {**base, cursor_key: cursor}
+            return dict(base)
+        return page_params
+
+    def _tweet_page(self, *keys: str) -> Callable[[dict], tuple[list[dict], str]]:
+        """Page parser for tweet lists, taking the first of `keys` that has items."""
+        def parse_page(data: dict) -> tuple[list[dict], str]:
+            raw_tweets: list = []
+            for key in keys:
+                raw_tweets = self._extract_list(data, key)
+                if raw_tweets:
+                    break
+            return [self._normalize_tweet(t) for t in raw_tweets], data.get("next_cursor") or ""
+        return parse_page
 
-            cursor = cursor_out
 
     async def get_mentions(
         self,
@@ -544,19 +723,25 @@ class TwitterClient:
         data = await self._request("GET", "/twitter/user/mentions", params)
         return data
 
-    async def get_users_bulk(self, usernames: list[str]) -> list[dict]:
+    async def get_users_bulk(self, usernames: list[str], concurrency: int = 16) -> list[dict]:
         """
-        Get user info for multiple usernames.
-        Returns list of normalized user data.
+        Get user info for multiple usernames, up to `concurrency` lookups at a time.
+        Returns list of normalized user data, in input order; each distinct
+        username is requested once.
         """
-        results = []
-        for username in usernames:
-            try:
-                user = await self.get_user_by_username(username)
-                if user and user.get("id"):
-                    results.append(user)
-            except TwitterAPIError as e:
-                # Skip users that fail (suspended, not found, etc.)
-                if e.status_code not in (404, 403):
-                    raise
-        return results
+        semaphore = asyncio.Semaphore(concurrency)
+
+        async def lookup(username: str) -> Optional[dict]:
+            async with semaphore:
+                try:
+                    return await self.get_user_by_username(username)
+                except TwitterAPIError as e:
+                    # Skip users that fail (suspended, not found, etc.)
+                    if e.status_code not in (404, 403):
+                        raise
+                    return None
+
+        # Repeated usernames share one lookup
+        unique = list(dict.fromkeys(usernames))
+        found = dict(zip(unique, await asyncio.gather(*(lookup(username) for username in unique))))
+        return [found[username] for username in usernames if found[username] and found[username].get("id")]
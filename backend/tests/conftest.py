@@ -0,0 +1,76 @@
+"""Shared database fixtures."""
+import pytest
+from sqlalchemy import create_engine, event
+from sqlalchemy.orm import Session
+from sqlalchemy.pool import StaticPool
+
+from social_graph.database import Base
+
+
+@pytest.fixture(scope="session")
+def engine():
+    """In-memory database with the schema created once per test session."""
+    # StaticPool: every checkout, from any thread, gets the one connection
+    # (and so the one database) rather than a fresh empty :memory: database
+    engine = create_engine(
+        "sqlite:///:memory:",
+        connect_args={"check_same_thread": False},
+        poolclass=StaticPool
+    )
+
+    @event.listens_for(engine, "connect")
+    def _configure_connection(dbapi_connection, connection_record):
+        # pysqlite's own transaction handling breaks SAVEPOINTs; emit BEGIN ourselves
+        dbapi_connection.isolation_level = None
+        # Nothing here needs to survive a crash
+        cursor = dbapi_connection.cursor()
+        cursor.execute("PRAGMA synchronous=OFF")
+        cursor.execute("PRAGMA journal_mode=MEMORY")
+        cursor.execute("PRAGMA temp_store=MEMORY")
+        cursor.close()
+
+    @event.listens_for(engine, "begin")
+    def _begin(conn):
+        conn.exec_driver_sql("BEGIN")
+
+    Base.metadata.create_all(engine)
+    yield engine
+    engine.dispose()
+
+
+@pytest.fixture(scope="session")
+def connection(engine):
+    """One connection shared by every test."""
+    with engine.connect() as connection:
+        yield connection
+
+
+@pytest.fixture(scope="module")
+def module_session(connection):
+    """
+    Session for module-scoped reference data, inside a transaction that
+    stays open for the module's tests and is rolled back after them.
+    """
+    transaction = connection.begin()
+    session = Session(bind=connection, join_transaction_mode="create_savepoint")
+    yield session
+    session.close()
+    transaction.rollback()
+
+
+@pytest.fixture
+def db_session(connection):
+    """
+    Session inside an outer transaction that is rolled back after the test.
+    Commits in the code under test only release SAVEPOINTs. Under an open
+    module_session transaction the outer transaction is itself a SAVEPOINT,
+    so module data survives while each test's changes are undone.
+    """
+    if connection.in_transaction():
+        transaction = connection.begin_nested()
+    else:
+        transaction = connection.begin()
+    session = Session(bind=connection, join_transaction_mode="create_savepoint")
+    yield session
+    session.close()
+    transaction.rollback()
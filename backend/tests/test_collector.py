@@ -3,10 +3,7 @@ import pytest
 import json
 from datetime import datetime, timezone
 from unittest.mock import AsyncMock, MagicMock, patch
-from sqlalchemy import create_engine
-from sqlalchemy.orm import sessionmaker
 
-from social_graph.database import Base
 from social_graph.models import (
     Run, Account, Snapshot, SnapshotFollower, SnapshotFollowing,
     Interval, FollowEvent, RawFetch
@@ -17,17 +14,6 @@ from social_graph.collector import (
 from social_graph.twitter_client import TwitterAPIError
 
 
-@pytest.fixture
-def db_session():
-    """Create in-memory database session for testing."""
-    engine = create_engine("sqlite:///:memory:")
-    Base.metadata.create_all(engine)
-    Session = sessionmaker(bind=engine)
-    session = Session()
-    yield session
-    session.close()
-
-
 @pytest.fixture
 def mock_twitter_client():
     """Create mock Twitter client."""
@@ -152,30 +138,18 @@ class TestIntervalDiff:
         collector = Collector(db_session, mock_twitter_client)
         collector._start_run()
         
-        # Create accounts
-        for i in range(5):
-            acc = Account(account_id=f"acc_{i}", handle=f"user{i}")
-            db_session.add(acc)
-        db_session.commit()
-        
-        # Create first snapshot with accounts 0,1,2
+        # Create accounts, and snapshots with accounts 0,1,2 then 1,2,3,4
+        # (lost 0, gained 3,4)
         snap1 = Snapshot(run_id=collector.run.run_id, kind="followers", account_count=3)
-        db_session.add(snap1)
-        db_session.commit()
-        
-        for i in range(3):
-            sf = SnapshotFollower(snapshot_id=snap1.snapshot_id, account_id=f"acc_{i}")
-            db_session.add(sf)
-        db_session.commit()
-        
-        # Create second snapshot with accounts 1,2,3,4 (lost 0, gained 3,4)
         snap2 = Snapshot(run_id=collector.run.run_id, kind="followers", account_count=4)
-        db_session.add(snap2)
+        db_session.add_all([Account(account_id=f"acc_{i}", handle=f"user{i}") for i in range(5)])
+        db_session.add_all([snap1, snap2])
         db_session.commit()
         
-        for i in range(1, 5):
-            sf = SnapshotFollower(snapshot_id=snap2.snapshot_id, account_id=f"acc_{i}")
-            db_session.add(sf)
+        db_session.add_all(
+            [SnapshotFollower(snapshot_id=snap1.snapshot_id, account_id=f"acc_{i}") for i in range(3)]
+            + [SnapshotFollower(snapshot_id=snap2.snapshot_id, account_id=f"acc_{i}") for i in range(1, 5)]
+        )
         db_session.commit()
         
         # Compute diff
@@ -3,45 +3,36 @@ import pytest
 import json
 import math
 from datetime import datetime, timezone, timedelta
-from sqlalchemy import create_engine
-from sqlalchemy.orm import sessionmaker
 
-from social_graph.database import Base
+import numpy as np
+from sqlalchemy import event
+
+from social_graph import frame_builder
 from social_graph.models import (
-    Run, Account, Snapshot, SnapshotFollower, Interval, FollowEvent,
+    Run, Account, Snapshot, SnapshotFollower, SnapshotFollowing, Interval, FollowEvent,
     InteractionEvent, PostEngager, Post, Edge, Community, Position,
     PositionHistory, Frame
 )
 from social_graph.frame_builder import (
     FrameBuilder, GraphNode, GraphEdge,
     compute_recency_decay, simple_community_detection,
-    build_edges_from_interactions, force_directed_layout,
+    build_edges_from_interactions, force_directed_layout, compute_positions,
+    _repulsion_forces, _grid_repulsion_forces,
     utc_now, EDGE_WEIGHTS, RECENCY_DECAY_HALF_LIFE_DAYS
 )
 
 
-@pytest.fixture
-def db_session():
-    """Create in-memory database session for testing."""
-    engine = create_engine("sqlite:///:memory:")
-    Base.metadata.create_all(engine)
-    Session = sessionmaker(bind=engine)
-    session = Session()
-    yield session
-    session.close()
-
-
-@pytest.fixture
-def sample_interval(db_session):
-    """Create a sample interval with related data."""
+@pytest.fixture(scope="module")
+def sample_interval_id(module_session):
+    """Create a sample interval with related data, once per module."""
     run = Run(config_version="1.0.0", status="completed")
-    db_session.add(run)
-    db_session.commit()
+    module_session.add(run)
+    module_session.commit()
     
     snap1 = Snapshot(run_id=run.run_id, kind="followers", account_count=5)
     snap2 = Snapshot(run_id=run.run_id, kind="followers", account_count=7)
-    db_session.add_all([snap1, snap2])
-    db_session.commit()
+    module_session.add_all([snap1, snap2])
+    module_session.commit()
     
     interval = Interval(
         snapshot_start_id=snap1.snapshot_id,
@@ -51,27 +42,39 @@ def sample_interval(db_session):
         new_followers_count=2,
         lost_followers_count=0
     )
-    db_session.add(interval)
-    db_session.commit()
+    module_session.add(interval)
+    module_session.commit()
     
-    return interval
+    return interval.interval_id
 
 
 @pytest.fixture
-def sample_accounts(db_session):
-    """Create sample accounts for testing."""
-    accounts = []
-    for i in range(10):
-        acc = Account(
+def sample_interval(db_session, sample_interval_id):
+    """The module's sample interval, loaded in the test's session."""
+    return db_session.get(Interval, sample_interval_id)
+
+
+@pytest.fixture(scope="module")
+def sample_account_ids(module_session):
+    """Create sample accounts, once per module."""
+    accounts = [
+        Account(
             account_id=f"acc_{i}",
             handle=f"user{i}",
             name=f"User {i}",
             followers_count=100 * (i + 1)
         )
-        db_session.add(acc)
-        accounts.append(acc)
-    db_session.commit()
-    return accounts
+        for i in range(10)
+    ]
+    module_session.add_all(accounts)
+    module_session.commit()
+    return [f"acc_{i}" for i in range(10)]
+
+
+@pytest.fixture
+def sample_accounts(db_session, sample_account_ids):
+    """The module's sample accounts, loaded in the test's session."""
+    return [db_session.get(Account, account_id) for account_id in sample_account_ids]
 
 
 class TestUtcNow:
@@ -235,6 +238,34 @@ class TestForceDirectedLayout:
         final_dist = abs(x2 - x1)
         assert final_dist > initial_dist
 
+    def test_grid_repulsion_matches_all_pairs_within_cutoff(self):
+        """Grid repulsion equals all-pairs when every pair is within cutoff."""
+        pos = np.random.default_rng(0).uniform(-50, 50, size=(40, 3))
+
+        exact = _repulsion_forces(pos, 700.0)
+        grid = _grid_repulsion_forces(pos, 700.0, cutoff=1000.0)
+
+        assert np.allclose(exact, grid)
+
+
+class TestComputePositions:
+    """Test position seeding and layout."""
+
+    def test_positions_reproducible_per_interval(self, db_session, sample_interval):
+        """Rebuilding the same interval yields the same layout."""
+        nodes = [GraphNode(account_id=str(i)) for i in range(6)]
+        edges = [
+            GraphEdge(src_id="0", dst_id=str(i), edge_type="direct", weight=1.0)
+            for i in range(1, 6)
+        ]
+        communities = {str(i): i % 2 for i in range(6)}
+
+        first = compute_positions(db_session, sample_interval, nodes, edges, communities, ego_id="0")
+        second = compute_positions(db_session, sample_interval, nodes, edges, communities, ego_id="0")
+
+        assert first == second
+        assert first["0"] == (0.0, 0.0, 0.0)
+
 
 class TestFrameBuilder:
     """Test FrameBuilder class."""
@@ -268,6 +299,159 @@ class TestFrameBuilder:
         assert "edges" in frame
         assert "stats" in frame
     
+    def test_build_frame_from_snapshots(self, db_session, sample_interval):
+        """Test build_frame derives ego edges from follower/following snapshots."""
+        for account_id, followers in [("ego", 1000), ("f1", 600), ("f2", 700), ("g1", 800)]:
+            db_session.add(Account(account_id=account_id, handle=account_id, followers_count=followers))
+        db_session.commit()
+
+        following_snap = Snapshot(
+            run_id=db_session.query(Run).first().run_id,
+            kind="following",
+            captured_at=sample_interval.end_at - timedelta(hours=1)
+        )
+        db_session.add(following_snap)
+        db_session.commit()
+
+        db_session.add_all([
+            SnapshotFollower(snapshot_id=sample_interval.snapshot_start_id, account_id="f1"),
+            SnapshotFollower(snapshot_id=sample_interval.snapshot_end_id, account_id="f1"),
+            SnapshotFollower(snapshot_id=sample_interval.snapshot_end_id, account_id="f2"),
+            SnapshotFollowing(snapshot_id=following_snap.snapshot_id, account_id="f2"),
+            SnapshotFollowing(snapshot_id=following_snap.snapshot_id, account_id="g1"),
+        ])
+        db_session.commit()
+
+        builder = FrameBuilder(db_session)
+        frame = builder.build_frame(sample_interval, timeframe_days=30, ego_id="ego")
+
+        assert {n["id"] for n in frame["nodes"]} == {"ego", "f1", "f2", "g1"}
+        edge_types = {(e["source"], e["target"]): e["type"] for e in frame["edges"]}
+        assert edge_types[("ego", "f2")] == "mutual"
+        assert edge_types[("ego", "g1")] == "you_follow"
+        assert edge_types[("f1", "ego")] == "followers_you"
+
+    def test_build_frame_before_any_snapshot_skips_snapshot_queries(self, db_session, sample_interval):
+        """Test an interval predating every snapshot gives the ego alone (or nothing) without querying snapshot rows."""
+        db_session.add(Account(account_id="ego", handle="ego", followers_count=1000))
+        db_session.add(SnapshotFollower(snapshot_id=sample_interval.snapshot_end_id, account_id="ego"))
+        early = Interval(
+            snapshot_start_id=sample_interval.snapshot_start_id,
+            snapshot_end_id=sample_interval.snapshot_end_id,
+            start_at=datetime(2000, 1, 1),
+            end_at=datetime(2000, 1, 2)
+        )
+        db_session.add(early)
+        db_session.commit()
+
+        statements = []
+        connection = db_session.connection()
+
+        def record(conn, cursor, statement, parameters, context, executemany):
+            statements.append(statement)
+
+        builder = FrameBuilder(db_session)
+        event.listen(connection, "before_cursor_execute", record)
+        try:
+            ego_frame = builder.build_frame(early, timeframe_days=30, ego_id="ego")
+            plain_frame = builder.build_frame(early, timeframe_days=30)
+        finally:
+            event.remove(connection, "before_cursor_execute", record)
+
+        assert [n["id"] for n in ego_frame["nodes"]] == ["ego"]
+        assert plain_frame["nodes"] == []
+        assert not [s for s in statements if "snapshot_follow" in s]
+
+    def test_build_frame_reuses_previous_saved_layout(self, db_session, sample_interval, monkeypatch):
+        """Test an interval with the previous saved frame's topology keeps its layout; a changed one is recomputed."""
+        for account_id, followers in [("ego", 1000), ("f1", 600), ("f2", 700), ("f3", 800)]:
+            db_session.add(Account(account_id=account_id, handle=account_id, followers_count=followers))
+        db_session.add_all([
+            SnapshotFollower(snapshot_id=sample_interval.snapshot_end_id, account_id="f1"),
+            SnapshotFollower(snapshot_id=sample_interval.snapshot_end_id, account_id="f2"),
+        ])
+        # A second interval over the same snapshots shares the first's topology
+        later = Interval(
+            snapshot_start_id=sample_interval.snapshot_start_id,
+            snapshot_end_id=sample_interval.snapshot_end_id,
+            start_at=sample_interval.start_at,
+            end_at=sample_interval.end_at,
+            new_followers_count=0,
+            lost_followers_count=0
+        )
+        db_session.add(later)
+        db_session.commit()
+
+        calls = []
+        original = frame_builder.compute_positions
+        monkeypatch.setattr(
+            frame_builder, "compute_positions",
+            lambda *args, **kwargs: calls.append(1) or original(*args, **kwargs)
+        )
+
+        builder = FrameBuilder(db_session)
+        first = builder.build_frame(sample_interval, timeframe_days=30, ego_id="ego")
+        builder.save_frame(sample_interval, first, timeframe_window=30)
+        reused = builder.build_frame(later, timeframe_days=30, ego_id="ego")
+
+        assert len(calls) == 1
+        assert reused["nodes"] == first["nodes"]
+
+        db_session.add(SnapshotFollower(snapshot_id=sample_interval.snapshot_end_id, account_id="f3"))
+        db_session.commit()
+        changed = builder.build_frame(later, timeframe_days=30, ego_id="ego")
+
+        assert len(calls) == 2
+        assert "f3" in {n["id"] for n in changed["nodes"]}
+
+    def test_build_frame_layout_independent_of_earlier_builds(self, db_session, sample_interval):
+        """Test an interval's layout is the same whether or not one with the same topology was built (unsaved) first."""
+        for account_id, followers in [("ego", 1000), ("f1", 600), ("f2", 700), ("f3", 800)]:
+            db_session.add(Account(account_id=account_id, handle=account_id, followers_count=followers))
+        db_session.add_all([
+            SnapshotFollower(snapshot_id=sample_interval.snapshot_end_id, account_id=account_id)
+            for account_id in ("f1", "f2", "f3")
+        ])
+        later = Interval(
+            snapshot_start_id=sample_interval.snapshot_start_id,
+            snapshot_end_id=sample_interval.snapshot_end_id,
+            start_at=sample_interval.start_at,
+            end_at=sample_interval.end_at,
+            new_followers_count=0,
+            lost_followers_count=0
+        )
+        db_session.add(later)
+        db_session.commit()
+
+        def positions(frame):
+            return {n["id"]: (n["x"], n["y"], n["z"]) for n in frame["nodes"]}
+
+        alone = FrameBuilder(db_session).build_frame(later, timeframe_days=30, ego_id="ego")
+
+        builder = FrameBuilder(db_session)
+        builder.build_frame(sample_interval, timeframe_days=30, ego_id="ego")
+        after = builder.build_frame(later, timeframe_days=30, ego_id="ego")
+
+        assert positions(alone) == positions(after)
+
+    def test_network_edges_link_nearest_higher_tier(self, db_session):
+        """Test each account links to the closest follower count one tier up."""
+        counts = {"big": 5_000_000, "hub": 110_000, "t2_high": 99_000, "t2_low": 60_000, "t3": 40_000, "t5": 3_000}
+        for account_id, followers in counts.items():
+            db_session.add(Account(account_id=account_id, handle=account_id, followers_count=followers))
+        db_session.commit()
+
+        builder = FrameBuilder(db_session)
+        edges = builder._build_network_edges(set(counts), ego_id="big")
+        targets = {e.src_id: e.dst_id for e in edges}
+
+        assert targets["hub"] == "big"
+        assert targets["t2_high"] == "hub"
+        assert targets["t2_low"] == "hub"
+        assert targets["t3"] == "t2_low"
+        # Tier 4 is empty, so tier 5 skips up to the closest non-empty tier
+        assert targets["t5"] == "t3"
+
     def test_build_frame_handles_none_interval(self, db_session):
         """Test build_frame handles None interval gracefully."""
         builder = FrameBuilder(db_session)
@@ -300,6 +484,27 @@ class TestFrameBuilder:
         assert importance["acc_1"] > importance["acc_0"]
         assert importance["acc_1"] > importance["acc_2"]
     
+    def test_compute_importance_vectorized_matches_loop(self, db_session, monkeypatch):
+        """Test the NumPy importance path agrees with the per-node loop."""
+        builder = FrameBuilder(db_session)
+
+        nodes = {
+            f"n{i}": GraphNode(account_id=f"n{i}", followers_count=(i * 37) % 500)
+            for i in range(100)
+        }
+        edges = [
+            GraphEdge(src_id=f"n{i}", dst_id=f"n{(i * 7) % 100}", edge_type="direct", weight=1.0 + i % 3)
+            for i in range(100)
+        ]
+
+        vectorized = builder.compute_importance(nodes, edges)
+        monkeypatch.setattr(frame_builder, "VECTORIZE_MIN_NODES", len(nodes) + 1)
+        looped = builder.compute_importance(nodes, edges)
+
+        assert vectorized.keys() == looped.keys()
+        for account_id, score in looped.items():
+            assert vectorized[account_id] == pytest.approx(score)
+
     def test_prune_graph_respects_limits(self, db_session):
         """Test graph pruning respects node/edge limits."""
         builder = FrameBuilder(db_session)
@@ -327,6 +532,43 @@ class TestFrameBuilder:
         assert len(pruned_nodes) <= 10
         assert len(pruned_edges) <= 5
 
+    def test_prune_graph_keeps_score_prefix(self, db_session):
+        """Test pruning stops once the top nodes cover most of the importance."""
+        builder = FrameBuilder(db_session)
+
+        nodes = {
+            f"node_{i}": GraphNode(account_id=f"node_{i}", followers_count=1000)
+            for i in range(20)
+        }
+        # node_0 and node_1 carry nearly all the edge weight
+        edges = [GraphEdge(src_id="node_0", dst_id="node_1", edge_type="direct", weight=1000.0)]
+
+        pruned_nodes, _ = builder.prune_graph(nodes, edges, min_followers=0, coverage=0.5)
+        full_nodes, _ = builder.prune_graph(dict(nodes), edges, min_followers=0, coverage=1.0)
+
+        assert list(pruned_nodes)[:2] == ["node_0", "node_1"]
+        assert len(pruned_nodes) < len(full_nodes) == 20
+
+    def test_prune_graph_coverage_keeps_ego_and_new_followers(self, db_session):
+        """Test the coverage cut spares the ego, new followers and ego edges, however low they score."""
+        builder = FrameBuilder(db_session)
+
+        nodes = {
+            f"node_{i}": GraphNode(account_id=f"node_{i}", followers_count=1000, is_new=(i == 19))
+            for i in range(20)
+        }
+        nodes["ego"] = GraphNode(account_id="ego", followers_count=1000, is_ego=True)
+        edges = [
+            GraphEdge(src_id="node_0", dst_id="node_1", edge_type="direct", weight=1000.0),
+            GraphEdge(src_id="ego", dst_id="node_19", edge_type="you_follow", weight=0.1),
+        ]
+
+        pruned_nodes, pruned_edges = builder.prune_graph(nodes, edges, min_followers=0, coverage=0.5)
+
+        assert len(pruned_nodes) < 21
+        assert {"ego", "node_19", "node_0", "node_1"} <= set(pruned_nodes)
+        assert {(e.src_id, e.dst_id) for e in pruned_edges} == {("node_0", "node_1"), ("ego", "node_19")}
+
 
 class TestFramePersistence:
     """Test frame saving and retrieval."""
@@ -412,6 +654,95 @@ class TestFramePersistence:
         assert retrieved["interval_id"] == sample_interval.interval_id
         assert len(retrieved["nodes"]) == 1
     
+    def test_get_frame_reassembles_nodes_and_edges(self, db_session, sample_interval):
+        """Test frames round-trip although nodes/edges live in their own tables."""
+        builder = FrameBuilder(db_session)
+
+        frame_data = {
+            "interval_id": sample_interval.interval_id,
+            "timeframe_days": 30,
+            "timestamp": utc_now().isoformat(),
+            "ego_id": "ego",
+            "nodes": [
+                {"id": "ego", "handle": "me", "name": "Me", "avatar": None,
+                 "followers": 900, "importance": 1.0, "community": 0,
+                 "x": 0.0, "y": 0.0, "z": 0.0, "isNew": False, "isEgo": True},
+                {"id": "acc_1", "handle": "user1", "name": "User 1", "avatar": "a.png",
+                 "followers": 700, "importance": 0.42, "community": 3,
+                 "x": 1.5, "y": -2.25, "z": 8.0, "isNew": True, "isEgo": False}
+            ],
+            "edges": [
+                {"source": "acc_1", "target": "ego", "type": "followers_you", "weight": 0.6}
+            ],
+            "communities": [0, 3],
+            "stats": {"nodeCount": 2, "edgeCount": 1, "communityCount": 2, "newFollowers": 1}
+        }
+
+        builder.save_frame(sample_interval, frame_data, timeframe_window=30)
+        stored = db_session.query(Frame).filter(Frame.interval_id == sample_interval.interval_id).one()
+        retrieved = builder.get_frame(interval_id=sample_interval.interval_id, timeframe_window=30)
+
+        assert "edges" not in json.loads(stored.frame_json)
+        assert retrieved == frame_data
+
+    def test_built_frame_round_trips(self, db_session, sample_interval):
+        """Test a built frame comes back from get_frame unchanged: node and edge order, flags and metadata."""
+        for account_id, followers in [("ego", 1000), ("z_f", 900), ("a_f", 600), ("m_f", 700), ("g1", 800)]:
+            db_session.add(Account(
+                account_id=account_id, handle=f"h_{account_id}", name=f"Name {account_id}",
+                avatar_url=f"{account_id}.png", followers_count=followers
+            ))
+        following_snapshot = Snapshot(
+            run_id=db_session.get(Snapshot, sample_interval.snapshot_end_id).run_id,
+            kind="following",
+            captured_at=sample_interval.start_at
+        )
+        db_session.add(following_snapshot)
+        db_session.flush()
+        db_session.add_all([
+            SnapshotFollower(snapshot_id=sample_interval.snapshot_end_id, account_id=account_id)
+            for account_id in ("z_f", "a_f", "m_f")
+        ] + [
+            SnapshotFollowing(snapshot_id=following_snapshot.snapshot_id, account_id=account_id)
+            for account_id in ("m_f", "g1")
+        ])
+        db_session.add(FollowEvent(interval_id=sample_interval.interval_id, account_id="a_f", kind="new"))
+        db_session.commit()
+
+        builder = FrameBuilder(db_session)
+        built = builder.build_frame(sample_interval, timeframe_days=30, ego_id="ego")
+        builder.save_frame(sample_interval, built, timeframe_window=30)
+        retrieved = builder.get_frame(interval_id=sample_interval.interval_id, timeframe_window=30)
+
+        assert len(built["nodes"]) == 5 and len(built["edges"]) >= 4
+        assert [n["id"] for n in retrieved["nodes"]] == [n["id"] for n in built["nodes"]]
+        assert [(e["source"], e["target"]) for e in retrieved["edges"]] == [
+            (e["source"], e["target"]) for e in built["edges"]
+        ]
+        flags = {n["id"]: (n["isNew"], n["isEgo"]) for n in retrieved["nodes"]}
+        assert flags["a_f"] == (True, False)
+        assert flags["ego"] == (False, True)
+        assert retrieved == built
+
+    def test_second_timeframe_window_replaces_first(self, db_session, sample_interval):
+        """Test frames are stored per interval: saving another window drops the first window's frame."""
+        builder = FrameBuilder(db_session)
+        frame_data = {
+            "interval_id": sample_interval.interval_id,
+            "timeframe_days": 30,
+            "timestamp": utc_now().isoformat(),
+            "nodes": [],
+            "edges": [],
+            "communities": [],
+            "stats": {"nodeCount": 0, "edgeCount": 0, "communityCount": 0, "newFollowers": 0}
+        }
+
+        builder.save_frame(sample_interval, frame_data, timeframe_window=30)
+        builder.save_frame(sample_interval, {**frame_data, "timeframe_days": 7}, timeframe_window=7)
+
+        assert builder.get_frame(interval_id=sample_interval.interval_id, timeframe_window=30) is None
+        assert builder.get_frame(interval_id=sample_interval.interval_id, timeframe_window=7) is not None
+
     def test_get_frame_returns_none_for_missing(self, db_session):
         """Test get_frame returns None when no frame exists."""
         builder = FrameBuilder(db_session)
@@ -0,0 +1,104 @@
+"""Test seeding mock post attributions."""
+from datetime import datetime, timedelta
+
+import pytest
+
+from social_graph import mock_posts
+from social_graph.models import Run, Account, Snapshot, Interval, Post, PostAttribution
+from social_graph.mock_posts import MOCK_AUTHOR_ID, seed_mock_post_attributions
+from social_graph.post_attribution import decode_payload
+
+
+@pytest.fixture
+def intervals(db_session):
+    """Twelve consecutive daily intervals."""
+    run = Run(config_version="1.0.0", status="completed")
+    db_session.add(run)
+    db_session.commit()
+    snapshot = Snapshot(run_id=run.run_id, kind="followers")
+    db_session.add(snapshot)
+    db_session.commit()
+
+    base = datetime(2024, 1, 1)
+    intervals = [
+        Interval(
+            snapshot_start_id=snapshot.snapshot_id,
+            snapshot_end_id=snapshot.snapshot_id,
+            start_at=base + timedelta(days=i),
+            end_at=base + timedelta(days=i + 1)
+        )
+        for i in range(12)
+    ]
+    db_session.add_all(intervals)
+    db_session.commit()
+    return intervals
+
+
+def row_counts(db_session) -> tuple[int, int, int]:
+    return (
+        db_session.query(Account).count(),
+        db_session.query(Post).count(),
+        db_session.query(PostAttribution).count(),
+    )
+
+
+class TestSeedMockPostAttributions:
+    """Test writing mock posts and their attributions."""
+
+    def test_reseed_is_idempotent(self, db_session, intervals):
+        """Test seeding twice writes the same posts and leaves the same row counts."""
+        first = seed_mock_post_attributions(db_session, timeframe_window=30, limit=12)
+        counts = row_counts(db_session)
+        second = seed_mock_post_attributions(db_session, timeframe_window=30, limit=12)
+
+        assert first
+        assert [post["id"] for post in second] == [post["id"] for post in first]
+        assert row_counts(db_session) == counts
+        assert counts[2] == len(first)
+
+    def test_rebuild_with_smaller_limit_removes_stale_rows(self, db_session, intervals):
+        """Test a rebuild keeps only the attributions of the posts it generated."""
+        seeded = seed_mock_post_attributions(db_session, timeframe_window=30, limit=12)
+        kept = seed_mock_post_attributions(db_session, timeframe_window=30, limit=2, rebuild=True)
+
+        stored = {post_id for (post_id,) in db_session.query(PostAttribution.post_id)}
+        assert len(kept) < len(seeded)
+        assert stored == {post["id"] for post in kept}
+
+    def test_payload_round_trips(self, db_session, intervals):
+        """Test decoding a stored attribution gives back the seeded payload."""
+        posts = seed_mock_post_attributions(db_session, timeframe_window=30, limit=12)
+
+        rows = {row.post_id: row for row in db_session.query(PostAttribution)}
+        for post in posts:
+            assert decode_payload(rows[post["id"]]) == post
+
+    def test_existing_mock_author_kept(self, db_session, intervals):
+        """Test seeding with the mock author already stored neither fails nor overwrites it."""
+        db_session.add(Account(account_id=MOCK_AUTHOR_ID, handle="existing"))
+        db_session.commit()
+
+        posts = seed_mock_post_attributions(db_session, timeframe_window=30, limit=12)
+
+        assert posts
+        assert db_session.get(Account, MOCK_AUTHOR_ID).handle == "existing"
+        assert db_session.query(Post).filter(Post.author_id == MOCK_AUTHOR_ID).count() == len(posts)
+
+    def test_failed_seed_leaves_no_rows(self, db_session, intervals, monkeypatch):
+        """Test a seed failing after its first batch writes nothing once rolled back."""
+        calls = []
+        original = mock_posts.upsert_rows
+
+        def failing_upsert(*args, **kwargs):
+            calls.append(1)
+            if len(calls) > 2:
+                raise RuntimeError("write failed")
+            return original(*args, **kwargs)
+
+        monkeypatch.setattr(mock_posts, "SEED_BATCH_SIZE", 1)
+        monkeypatch.setattr(mock_posts, "upsert_rows", failing_upsert)
+        with pytest.raises(RuntimeError):
+            seed_mock_post_attributions(db_session, timeframe_window=30, limit=12)
+        db_session.rollback()
+
+        assert db_session.query(PostAttribution).count() == 0
@@ -1,10 +1,7 @@
 """Test database models."""
 import pytest
 from datetime import datetime, timezone
-from sqlalchemy import create_engine
-from sqlalchemy.orm import sessionmaker
 
-from social_graph.database import Base
 from social_graph.models import (
     Run, Account, Snapshot, SnapshotFollower, SnapshotFollowing,
     Interval, FollowEvent, InteractionEvent, Post, PostEngager,
@@ -13,17 +10,6 @@ from social_graph.models import (
 )
 
 
-@pytest.fixture
-def db_session():
-    """Create in-memory database session for testing."""
-    engine = create_engine("sqlite:///:memory:")
-    Base.metadata.create_all(engine)
-    Session = sessionmaker(bind=engine)
-    session = Session()
-    yield session
-    session.close()
-
-
 def test_create_run(db_session):
     """Test creating a collection run."""
     run = Run(
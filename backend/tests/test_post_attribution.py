@@ -0,0 +1,179 @@
+"""Test post attribution: interval resolution, lookback windows and tiering."""
+import weakref
+from datetime import datetime, timedelta
+
+import numpy as np
+import pytest
+from sqlalchemy import event
+
+from social_graph import post_attribution
+from social_graph.models import (
+    Run, Account, Snapshot, Interval, FollowEvent, PostEngager, Post
+)
+from social_graph.post_attribution import (
+    build_post_attributions, load_post_attributions, _resolve_post_intervals, _window_interval_ids
+)
+
+
+T0 = datetime(2024, 1, 1)
+
+
+def day(n: float) -> datetime:
+    return T0 + timedelta(days=n)
+
+
+def make_timeline(*spans):
+    """Timeline arrays from (interval_id, start_day, end_day), ordered by end."""
+    return (
+        np.array([interval_id for interval_id, _, _ in spans], dtype=np.int64),
+        np.array([day(start) for _, start, _ in spans], dtype="datetime64[us]"),
+        np.array([day(end) for _, _, end in spans], dtype="datetime64[us]"),
+    )
+
+
+@pytest.fixture(autouse=True)
+def attribution_cache(monkeypatch):
+    """Start every test with an empty attribution cache."""
+    monkeypatch.setattr(post_attribution, "_attribution_cache", weakref.WeakKeyDictionary())
+
+
+class TestResolvePostIntervals:
+    """Test mapping post timestamps to intervals."""
+
+    # Interval 1 covers days 0-1, a gap until day 3, then 2 (days 3-4) and 3 (days 4-8)
+    TIMELINE = make_timeline((1, 0, 1), (2, 3, 4), (3, 4, 8))
+
+    def test_post_inside_interval(self):
+        """Test a post inside an interval resolves to it."""
+        assert _resolve_post_intervals(self.TIMELINE, [day(0.5), day(3.5), day(6)]) == [1, 2, 3]
+
+    def test_post_before_first_and_after_last(self):
+        """Test posts outside the timeline resolve to the first and last interval."""
+        assert _resolve_post_intervals(self.TIMELINE, [day(-5), day(20)]) == [1, 3]
+
+    def test_post_in_gap_picks_nearest_end(self):
+        """Test a post between intervals resolves to the one whose end is nearest."""
+        assert _resolve_post_intervals(self.TIMELINE, [day(1.5), day(3.0) - timedelta(hours=1)]) == [1, 2]
+
+    def test_equidistant_post_picks_later_interval(self):
+        """Test a post equally far from two interval ends goes to the later interval."""
+        assert _resolve_post_intervals(self.TIMELINE, [day(2.5)]) == [2]
+
+    def test_empty_timeline(self):
+        """Test every post is unresolved without intervals."""
+        assert _resolve_post_intervals(make_timeline(), [day(0), day(1)]) == [None, None]
+
+
+class TestWindowIntervalIds:
+    """Test lookback window membership."""
+
+    TIMELINE = make_timeline((1, 0, 1), (2, 3, 4), (3, 4, 8))
+
+    def test_intervals_ending_within_lookback(self):
+        """Test the window holds intervals ending from the post up to the lookback, inclusive."""
+        windows = _window_interval_ids(self.TIMELINE, [day(0.5), day(1), day(5)], lookback_days=3)
+
+        assert windows == [[1], [1, 2], [3]]
+
+    def test_interval_ending_before_post_excluded(self):
+        """Test intervals that ended before the post are outside its window."""
+        assert _window_interval_ids(self.TIMELINE, [day(9)], lookback_days=7) == [[]]
+
+
+class TestBuildPostAttributions:
+    """Test attribution tiers computed from stored events."""
+
+    @pytest.fixture
+    def intervals(self, db_session):
+        """Three consecutive intervals: days 0-1, 1-2 and 2-10."""
+        run = Run(config_version="1.0.0", status="completed")
+        db_session.add(run)
+        db_session.commit()
+        snapshots = [Snapshot(run_id=run.run_id, kind="followers", captured_at=day(n)) for n in (0, 1, 2, 10)]
+        db_session.add_all(snapshots)
+        db_session.commit()
+
+        intervals = [
+            Interval(
+                snapshot_start_id=start.snapshot_id,
+                snapshot_end_id=end.snapshot_id,
+                start_at=start.captured_at,
+                end_at=end.captured_at
+            )
+            for start, end in zip(snapshots, snapshots[1:])
+        ]
+        db_session.add_all(intervals)
+        db_session.commit()
+        return intervals
+
+    def test_tiers(self, db_session, intervals, monkeypatch):
+        """Test engaged, same-interval and later-in-window followers land in high, medium and low."""
+        monkeypatch.setattr(post_attribution.settings, "attribution_lookback_days", 7)
+        first, second, third = intervals
+        for account_id in ("author", "engaged", "same", "later", "outside"):
+            db_session.add(Account(account_id=account_id, handle=account_id))
+        db_session.add(Post(post_id="p1", author_id="author", created_at=day(0.5), text="hello"))
+        db_session.add_all([
+            FollowEvent(interval_id=first.interval_id, account_id="engaged", kind="new"),
+            FollowEvent(interval_id=first.interval_id, account_id="same", kind="new"),
+            FollowEvent(interval_id=second.interval_id, account_id="later", kind="new"),
+            # The third interval ends 9.5 days after the post, past the lookback
+            FollowEvent(interval_id=third.interval_id, account_id="outside", kind="new"),
+            PostEngager(interval_id=first.interval_id, post_id="p1", account_id="engaged", engager_type="like"),
+        ])
+        db_session.commit()
+
+        [payload] = build_post_attributions(db_session, timeframe_window=30, limit=10)
+
+        assert payload["interval_id"] == first.interval_id
+        assert payload["attribution"] == {"high": 1, "medium": 1, "low": 1}
+        assert payload["follower_delta"] == 1
+        assert set(payload["attributed_follower_ids"]) == {"engaged", "same", "later"}
+        assert "Followed within lookback window" in payload["evidence"]
+
+    def test_incremental_build_only_attributes_newer_posts(self, db_session, intervals):
+        """Test a repeat build with nothing new is one probe, and a newer post is attributed and listed first."""
+        first, second, _ = intervals
+        db_session.add(Account(account_id="author", handle="author"))
+        db_session.add(Post(post_id="p1", author_id="author", created_at=day(0.5), text="first"))
+        db_session.commit()
+        build_post_attributions(db_session, timeframe_window=30, limit=10)
+        # Loads the stored attributions into the cache
+        build_post_attributions(db_session, timeframe_window=30, limit=10)
+
+        statements = []
+        connection = db_session.connection()
+
+        def record(conn, cursor, statement, parameters, context, executemany):
+            statements.append(statement)
+
+        event.listen(connection, "before_cursor_execute", record)
+        try:
+            unchanged = build_post_attributions(db_session, timeframe_window=30, limit=10)
+        finally:
+            event.remove(connection, "before_cursor_execute", record)
+
+        assert len(statements) == 1
+        assert [p["id"] for p in unchanged] == ["p1"]
+
+        db_session.add(Post(post_id="p2", author_id="author", created_at=day(1.5), text="second"))
+        db_session.commit()
+        updated = build_post_attributions(db_session, timeframe_window=30, limit=10)
+
+        assert [p["id"] for p in updated] == ["p2", "p1"]
+        assert updated[0]["interval_id"] == second.interval_id
+
+    def test_cached_payloads_are_copies(self, db_session, intervals):
+        """Test changing a loaded payload does not change what the next load returns."""
+        db_session.add(Account(account_id="author", handle="author"))
+        db_session.add(Post(post_id="p1", author_id="author", created_at=day(0.5), text="first"))
+        db_session.commit()
+        build_post_attributions(db_session, timeframe_window=30, limit=10)
+
+        [payload] = load_post_attributions(db_session, timeframe_window=30, limit=10)
+        payload["text"] = "changed"
+        payload["attribution"]["high"] = 99
+        [again] = load_post_attributions(db_session, timeframe_window=30, limit=10)
+
+        assert again["text"] == "first"
+        assert again["attribution"]["high"] == 0
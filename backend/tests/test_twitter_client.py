@@ -0,0 +1,278 @@
+"""Test the TwitterAPI.io client against a mocked transport."""
+import asyncio
+import gc
+from contextlib import aclosing
+
+import httpx
+import pytest
+
+from social_graph import twitter_client
+from social_graph.config import settings
+from social_graph.twitter_client import TwitterClient, TwitterAPIError
+
+
+@pytest.fixture
+async def make_client():
+    """Build TwitterClients whose requests go to an httpx.MockTransport handler."""
+    clients = []
+
+    def make(handler) -> TwitterClient:
+        client = TwitterClient(api_key="test", cache_enabled=False)
+        client.client = httpx.AsyncClient(
+            base_url=TwitterClient.BASE_URL,
+            transport=httpx.MockTransport(handler)
+        )
+        clients.append(client)
+        return client
+
+    yield make
+    for client in clients:
+        await client.close()
+    await TwitterClient.shutdown()
+
+
+def follower_page(username: str, cursor: str, next_cursor: str) -> httpx.Response:
+    """One page of two followers, with ids naming the user and page."""
+    return httpx.Response(200, json={
+        "followers": [
+            {"id": f"{username}-{cursor or 'first'}-{i}", "userName": f"u{i}"}
+            for i in range(2)
+        ],
+        "next_cursor": next_cursor,
+    })
+
+
+class TestPaginatePrefetch:
+    """Test the background request for the next page."""
+
+    async def test_prefetch_cancelled_when_consumer_stops_early(self, make_client):
+        """Test the in-flight next page is cancelled once the caller stops reading."""
+        prefetch_started = asyncio.Event()
+        cancelled = []
+
+        async def handler(request):
+            cursor = request.url.params.get("cursor")
+            if cursor is None:
+                return follower_page("a", cursor, "c1")
+            prefetch_started.set()
+            try:
+                await asyncio.Event().wait()
+            except asyncio.CancelledError:
+                cancelled.append(cursor)
+                raise
+
+        client = make_client(handler)
+        pages = []
+        async with aclosing(client.paginate_followers(None, username="a", prefetch=True)) as paginator:
+            async for users, _, _, _ in paginator:
+                pages.append(users)
+                await prefetch_started.wait()
+                break
+        # Let the cancellation reach the handler
+        await asyncio.sleep(0)
+
+        assert len(pages) == 1
+        assert cancelled == ["c1"]
+
+    async def test_no_prefetch_by_default(self, make_client):
+        """Test a caller that stops after one page only requests that page."""
+        cursors = []
+
+        def handler(request):
+            cursor = request.url.params.get("cursor")
+            cursors.append(cursor)
+            return follower_page("a", cursor, "c1")
+
+        client = make_client(handler)
+        async with aclosing(client.paginate_followers(None, username="a")) as paginator:
+            async for _ in paginator:
+                await asyncio.sleep(0.01)
+                break
+
+        assert cursors == [None]
+
+    async def test_prefetch_yields_same_pages(self, make_client):
+        """Test prefetching returns the same pages, in order, as sequential paging."""
+        def handler(request):
+            cursor = request.url.params.get("cursor")
+            next_cursor = {None: "c1", "c1": "c2", "c2": ""}[cursor]
+            return follower_page("a", cursor, next_cursor)
+
+        client = make_client(handler)
+        results = {}
+        for prefetch in (False, True):
+            results[prefetch] = [
+                (cursor_in, cursor_out, [u["id"] for u in users])
+                async for users, cursor_in, cursor_out, _ in client.paginate_followers(
+                    None, username="a", prefetch=prefetch
+                )
+            ]
+
+        assert results[True] == results[False]
+        assert [cursor_out for _, cursor_out, _ in results[True]] == ["c1", "c2", ""]
+
+
+class TestBulkUserLists:
+    """Test concurrent follower collection for several users."""
+
+    async def test_semaphore_bounds_users_and_keeps_order(self, make_client):
+        """Test at most `concurrency` users are fetched at once and results keep input order."""
+        usernames = ["slow", "mid", "fast", "last"]
+        delays = {"slow": 0.03, "mid": 0.02, "fast": 0.0, "last": 0.01}
+        in_flight = {username: 0 for username in usernames}
+        max_active_users = 0
+
+        async def handler(request):
+            nonlocal max_active_users
+            username = request.url.params["userName"]
+            cursor = request.url.params.get("cursor")
+            in_flight[username] += 1
+            max_active_users = max(max_active_users, sum(1 for n in in_flight.values() if n))
+            try:
+                await asyncio.sleep(delays[username])
+                return follower_page(username, cursor, "c1" if cursor is None else "")
+            finally:
+                in_flight[username] -= 1
+
+        client = make_client(handler)
+        result = await client.get_followers_bulk(usernames, concurrency=2)
+
+        assert max_active_users == 2
+        assert list(result) == usernames
+        for username in usernames:
+            assert [u["id"] for u in result[username]] == [
+                f"{username}-first-0", f"{username}-first-1", f"{username}-c1-0", f"{username}-c1-1"
+            ]
+
+
+class TestUserLookupCache:
+    """Test memoized, coalesced username lookups."""
+
+    async def test_concurrent_lookups_share_one_request(self, make_client):
+        """Test concurrent lookups of one username (any case) make a single request."""
+        requests = []
+
+        async def handler(request):
+            requests.append(request.url.params["userName"])
+            await asyncio.sleep(0.01)
+            return httpx.Response(200, json={"data": {"id": "1", "userName": "Alice"}})
+
+        client = make_client(handler)
+        users = await asyncio.gather(*(
+            client.get_user_by_username(name) for name in ("alice", "Alice", "ALICE")
+        ))
+        again = await client.get_user_by_username("alice")
+
+        assert len(requests) == 1
+        assert [user["id"] for user in users] == ["1", "1", "1"]
+        assert again["id"] == "1"
+
+    async def test_lookups_return_copies(self, make_client):
+        """Test changing a returned user changes neither other waiters' results nor the cache."""
+        async def handler(request):
+            await asyncio.sleep(0.01)
+            return httpx.Response(200, json={"data": {"id": "1", "userName": "Alice", "followers": 5}})
+
+        client = make_client(handler)
+        first, second = await asyncio.gather(
+            client.get_user_by_username("alice"), client.get_user_by_username("alice")
+        )
+        first["name"] = "changed"
+        first["public_metrics"]["followers_count"] = 99
+        cached = await client.get_user_by_username("alice")
+
+        for user in (second, cached):
+            assert user["name"] is None
+            assert user["public_metrics"]["followers_count"] == 5
+
+    async def test_failed_lookup_is_not_cached(self, make_client):
+        """Test an error reaches every waiter and the next lookup retries."""
+        requests = []
+
+        async def handler(request):
+            requests.append(request.url.params["userName"])
+            await asyncio.sleep(0.01)
+            return httpx.Response(404, json={"error": "not found"})
+
+        client = make_client(handler)
+        results = await asyncio.gather(
+            client.get_user_by_username("gone"),
+            client.get_user_by_username("gone"),
+            return_exceptions=True
+        )
+        with pytest.raises(TwitterAPIError):
+            await client.get_user_by_username("gone")
+
+        assert [r.status_code for r in results] == [404, 404]
+        assert len(requests) == 2
+
+    async def test_failure_after_waiter_cancelled_is_retrieved(self, make_client):
+        """Test a lookup that fails after its only waiter was cancelled is not reported as unretrieved."""
+        release = asyncio.Event()
+
+        async def handler(request):
+            await release.wait()
+            return httpx.Response(500, json={"error": "boom"})
+
+        loop = asyncio.get_running_loop()
+        reported = []
+        previous_handler = loop.get_exception_handler()
+        loop.set_exception_handler(lambda _, context: reported.append(context))
+        try:
+            client = make_client(handler)
+            waiter = asyncio.create_task(client.get_user_by_username("alice"))
+            await asyncio.sleep(0.01)
+            waiter.cancel()
+            with pytest.raises(asyncio.CancelledError):
+                await waiter
+
+            release.set()
+            while client._user_lookups:
+                await asyncio.sleep(0)
+            gc.collect()
+        finally:
+            loop.set_exception_handler(previous_handler)
+
+        assert reported == []
+
+
+class TestResponseCache:
+    """Test the on-disk cache of 200 responses."""
+
+    async def test_hit_expiry_and_errors(self, tmp_path, monkeypatch):
+        """Test a 200 is served from cache until it expires, errors are never cached, and clients share the cache."""
+        monkeypatch.setattr(settings, "api_cache_path", str(tmp_path / "cache.db"))
+        monkeypatch.setattr(settings, "api_cache_ttl_seconds", 3600.0)
+        monkeypatch.setattr(twitter_client, "_response_caches", {})
+        requests = []
+
+        def handler(request):
+            requests.append(request.url.params["userName"])
+            if request.url.params["userName"] == "gone":
+                return httpx.Response(404, json={"error": "not found"})
+            return httpx.Response(200, json={"data": {"id": "1"}})
+
+        client = TwitterClient(api_key="test", cache_enabled=True)
+        other = TwitterClient(api_key="test", cache_enabled=True)
+        for each in (client, other):
+            await each.client.aclose()
+            each.client = httpx.AsyncClient(base_url=TwitterClient.BASE_URL, transport=httpx.MockTransport(handler))
+        try:
+            params = {"userName": "alice"}
+            first = await client._request("GET", "/twitter/user/info", params=params)
+            again = await other._request("GET", "/twitter/user/info", params=params)
+            for _ in range(2):
+                with pytest.raises(TwitterAPIError):
+                    await client._request("GET", "/twitter/user/info", params={"userName": "gone"})
+
+            assert other.cache is client.cache
+            assert first == again == {"data": {"id": "1"}}
+            assert requests == ["alice", "gone", "gone"]
+
+            client.cache.ttl_seconds = -1.0
+            await client._request("GET", "/twitter/user/info", params=params)
+            assert requests[-1] == "alice" and len(requests) == 4
+        finally:
+            await client.close()
+            await other.close()
+            client.cache.close()